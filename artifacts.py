@@ -0,0 +1,192 @@
+"""Staging data as gzip'd PostgreSQL binary COPY files plus a manifest.
+
+seeder.py --format binary writes one <stage table>.copy.gz per staging
+table and manifest.json (row counts, sha256 of each uncompressed stream,
+sizes, and the generation settings). loader.py --from-artifacts streams
+them back with COPY ... (FORMAT binary), so Postgres never parses
+timestamps or numerics from text, and checks every count and checksum.
+
+Columns are encoded a whole array at a time from the types in
+seeder.STAGE_TABLES: integer, timestamp, text and numeric(p,s) given as
+integer units of the scale (cents for numeric(10,2)). A numpy masked
+array marks NULLs.
+"""
+import os
+import re
+import gzip
+import json
+import hashlib
+from datetime import datetime
+import numpy as np
+
+HEADER = b'PGCOPY\n\xff\r\n\x00' + (0).to_bytes(4, 'big') + (0).to_bytes(4, 'big')
+TRAILER = (-1).to_bytes(2, 'big', signed=True)
+MANIFEST = 'manifest.json'
+SUFFIX = '.copy.gz'
+COMPRESSLEVEL = 1           # level 1 gets most of the size win at a fraction of the time of 6
+READ_SIZE = 1 << 20
+PG_EPOCH = np.datetime64('2000-01-01T00:00:00', 'us')
+
+
+def column_types(spec):
+    """'order_id integer, total numeric(10,2)' -> [('order_id', 'integer'), ('total', 'numeric(10,2)')]."""
+    return [tuple(part.split(None, 1)) for part in spec.split(', ')]
+
+
+def _fixed(values, dtype):
+    a = np.ascontiguousarray(np.asarray(values).astype(dtype))
+    return a.view(np.uint8).reshape(len(a), -1), np.full(len(a), a.dtype.itemsize)
+
+
+def _integer(values, _):
+    return _fixed(np.asarray(values, dtype=np.int64), '>i4')
+
+
+def _timestamp(values, _):
+    micros = (np.asarray(values).astype('datetime64[us]') - PG_EPOCH).astype(np.int64)
+    return _fixed(micros, '>i8')
+
+
+def _numeric(values, sql_type):
+    """Fixed three base-10000 digits (Postgres strips the zero ones), enough for numeric(10,s)."""
+    scale = int(re.search(r',\s*(\d+)\)', sql_type).group(1))
+    units = np.asarray(values, dtype=np.int64)
+    whole, frac = np.divmod(np.abs(units), 10 ** scale)
+    if len(whole) and whole.max() >= 10 ** 8:
+        raise ValueError(f'value too large for {sql_type}')
+    words = np.stack([
+        np.full(len(units), 3), np.ones(len(units)), np.where(units < 0, 0x4000, 0), np.full(len(units), scale),
+        whole // 10000, whole % 10000, frac * 10 ** (4 - scale),
+    ], axis=1)
+    return _fixed(words, '>i2')[0].reshape(len(units), -1), np.full(len(units), 14)
+
+
+def _text(values, _):
+    encoded = np.char.encode(np.asarray(values, dtype=str), 'utf-8')
+    width = max(encoded.dtype.itemsize, 1)
+    payload = np.ascontiguousarray(encoded.astype(f'S{width}')).view(np.uint8).reshape(len(encoded), width)
+    return payload, np.char.str_len(encoded)
+
+
+ENCODERS = {'integer': _integer, 'timestamp': _timestamp, 'numeric': _numeric, 'text': _text}
+
+
+def encode(spec, columns):
+    """Binary COPY tuples (no header or trailer) for parallel column arrays typed by a STAGE_TABLES spec."""
+    types = column_types(spec)
+    if len(types) != len(columns):
+        raise ValueError(f'{len(columns)} columns for {len(types)} in {spec!r}')
+    n = len(columns[0])
+    if n == 0:
+        return b''
+    blocks = [_fixed(np.full(n, len(types)), '>i2')[0]]
+    keep = [np.ones((n, 2), dtype=bool)]
+    for (_, sql_type), values in zip(types, columns):
+        null = np.ma.getmaskarray(values) if isinstance(values, np.ma.MaskedArray) else np.zeros(n, dtype=bool)
+        payload, length = ENCODERS[sql_type.split('(')[0]](np.ma.getdata(values), sql_type)
+        length = np.where(null, -1, length)
+        blocks += [_fixed(length, '>i4')[0], payload]
+        keep += [np.ones((n, 4), dtype=bool), np.arange(payload.shape[1]) < length[:, None]]
+    # every row padded to the widest value, then the padding dropped in one pass
+    return np.concatenate(blocks, axis=1)[np.concatenate(keep, axis=1)].tobytes()
+
+
+def encode_rows(spec, rows):
+    """encode() for a list of row tuples, such as the catalog; numerics may be Decimals or floats."""
+    columns = []
+    for (_, sql_type), values in zip(column_types(spec), zip(*rows)):
+        if sql_type.startswith('numeric'):
+            scale = int(re.search(r',\s*(\d+)\)', sql_type).group(1))
+            values = [round(v * 10 ** scale) for v in values]
+        columns.append(list(values))
+    return encode(spec, columns) if rows else b''
+
+
+class ArtifactWriter:
+    """One gzip'd binary COPY stream per table; manifest.json is written last, on a clean close."""
+
+    def __init__(self, out_dir, tables, compresslevel=COMPRESSLEVEL, **meta):
+        self.out_dir = out_dir
+        self.meta = meta
+        self.files, self.hashes, self.rows, self.sizes = {}, {}, {}, {}
+        for table in tables:
+            # mtime=0 keeps the files byte-identical between runs
+            self.files[table] = gzip.GzipFile(os.path.join(out_dir, table + SUFFIX), 'wb', compresslevel, mtime=0)
+            self.hashes[table] = hashlib.sha256()
+            self.rows[table] = self.sizes[table] = 0
+            self._put(table, HEADER)
+
+    def _put(self, table, data):
+        self.files[table].write(data)
+        self.hashes[table].update(data)
+        self.sizes[table] += len(data)
+
+    def write(self, table, data, rows):
+        self._put(table, data)
+        self.rows[table] += rows
+
+    def close(self):
+        entries = {}
+        for table, f in self.files.items():
+            self._put(table, TRAILER)
+            f.close()
+            entries[table] = {
+                'file': table + SUFFIX,
+                'rows': self.rows[table],
+                'sha256': self.hashes[table].hexdigest(),
+                'bytes': self.sizes[table],
+                'compressed_bytes': os.path.getsize(os.path.join(self.out_dir, table + SUFFIX)),
+            }
+        manifest = {'format': 'postgresql binary copy, gzip', 'created_at': datetime.now().isoformat(timespec='seconds'),
+                    **self.meta, 'tables': entries}
+        tmp = os.path.join(self.out_dir, MANIFEST + '.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, default=str)
+        os.replace(tmp, os.path.join(self.out_dir, MANIFEST))
+        return manifest
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            for f in self.files.values():
+                f.close()
+
+
+def read_manifest(artifact_dir):
+    with open(os.path.join(artifact_dir, MANIFEST), encoding='utf-8') as f:
+        return json.load(f)
+
+
+class VerifyingReader:
+    """File-like gzip reader for copy_expert that hashes what it hands over."""
+
+    def __init__(self, path):
+        self.f = gzip.open(path, 'rb')
+        self.sha = hashlib.sha256()
+
+    def read(self, size=READ_SIZE):
+        data = self.f.read(size)
+        self.sha.update(data)
+        return data
+
+    def close(self):
+        self.f.close()
+
+
+def copy_artifact(cursor, table, artifact_dir, entry):
+    """COPY one artifact into table on a DB-API cursor, then check its row count and checksum."""
+    path = os.path.join(artifact_dir, entry['file'])
+    reader = VerifyingReader(path)
+    try:
+        cursor.copy_expert(f'COPY {table} FROM STDIN WITH (FORMAT binary)', reader, size=READ_SIZE)
+    finally:
+        reader.close()
+    if reader.sha.hexdigest() != entry['sha256']:
+        raise ValueError(f'{path}: checksum does not match the manifest')
+    if cursor.rowcount != entry['rows']:
+        raise ValueError(f'{path}: loaded {cursor.rowcount} rows, manifest says {entry["rows"]}')
+    return cursor.rowcount
@@ -0,0 +1,101 @@
+"""Loading a large synthetic catalog: ORM add_all (the old fill_baseInfo way) vs catalog.load_catalog.
+
+Works in a throwaway schema, so existing data is untouched.
+Run from the repo root:  python -m benchmarks.catalog_load [--products 10000] [--recipes-per-product 10]
+"""
+import argparse
+import csv
+import os
+import tempfile
+import time
+
+from dotenv import load_dotenv
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+import catalog
+import db_schema
+from db_schema import Inventory, Product, ProductRecipe
+
+SCHEMA = "catalog_bench"
+
+
+def write_catalog(out_dir, n_products, n_ingredients, per_product):
+    """Synthetic CSVs in the data.csv / inventory.csv / recipes.csv formats."""
+    paths = [os.path.join(out_dir, name) for name in ("data.csv", "inventory.csv", "recipes.csv")]
+    ingredients = ["milk tea", "green tea"] + [f"ingredient {i}" for i in range(n_ingredients - 2)]
+    with open(paths[1], "w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["ingredient_name", "on_hand_quantity"])
+        w.writerows((name, 100) for name in ingredients)
+    with open(paths[0], "w", newline="") as pf, open(paths[2], "w", newline="") as rf:
+        pw, rw = csv.writer(pf), csv.writer(rf)
+        pw.writerow(["name", "price", "fruit", "tea"])
+        rw.writerow(["product_name", "ingredient_name", "quantity_per_unit"])
+        for p in range(n_products):
+            name = f"product {p}"
+            fruit = 2 + p % (n_ingredients - 2)
+            pw.writerow([name, f"${4 + p % 300 / 100:.2f}", ingredients[fruit], ("milk", "green")[p % 2]])
+            for k in range(1, per_product - 1):
+                rw.writerow([name, ingredients[2 + (fruit - 2 + k) % (n_ingredients - 2)], "0.5"])
+    return paths
+
+
+def orm_load(engine, cat):
+    with Session(engine) as session:
+        session.add_all(Inventory(ingredient_id=i, ingredient_name=n, on_hand_quantity=q) for i, n, q in cat.inventory)
+        session.add_all(Product(product_id=i, product_name=n, unit_price=u) for i, n, u in cat.products)
+        session.add_all(ProductRecipe(product_id=p, ingredient_id=i, quantity_per_unit=q) for p, i, q in cat.recipes)
+        session.commit()
+
+
+def bulk_load(engine, cat, method):
+    with engine.begin() as conn:
+        catalog.load_catalog(conn, cat, method)
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--url", help="SQLAlchemy database URL (overrides DATABASE_URL env)")
+    p.add_argument("--products", type=int, default=10_000)
+    p.add_argument("--ingredients", type=int, default=1_000)
+    p.add_argument("--recipes-per-product", type=int, default=10)
+    args = p.parse_args()
+    load_dotenv()
+    url = args.url or os.environ["DATABASE_URL"]
+
+    admin = create_engine(url)
+    with admin.begin() as conn:
+        conn.exec_driver_sql(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        conn.exec_driver_sql(f"CREATE SCHEMA {SCHEMA}")
+    engine = create_engine(url, connect_args={"options": f"-csearch_path={SCHEMA}"})
+    db_schema.create_tables(engine)
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            cat = catalog.read_catalog(*write_catalog(tmp, args.products, args.ingredients, args.recipes_per_product))
+        print(f"{len(cat.products)} products, {len(cat.inventory)} ingredients, {len(cat.recipes)} recipe rows\n")
+        print(f"{'path':<34}{'seconds':>10}{'vs ORM':>9}")
+        runs = [("ORM add_all (empty tables)", lambda: orm_load(engine, cat)),
+                ("Core multi-row upsert (empty)", lambda: bulk_load(engine, cat, "insert")),
+                ("Core multi-row upsert (reload)", lambda: bulk_load(engine, cat, "insert")),
+                ("COPY + upsert (empty)", lambda: bulk_load(engine, cat, "copy")),
+                ("COPY + upsert (reload)", lambda: bulk_load(engine, cat, "copy"))]
+        orm_s = None
+        for label, fn in runs:
+            if "reload" not in label:
+                with engine.begin() as conn:
+                    conn.exec_driver_sql("TRUNCATE product_recipe, products, inventory CASCADE")
+            t0 = time.perf_counter()
+            fn()
+            secs = time.perf_counter() - t0
+            orm_s = orm_s or secs
+            print(f"{label:<34}{secs:>10.2f}{orm_s / secs:>8.1f}x")
+    finally:
+        engine.dispose()
+        with admin.begin() as conn:
+            conn.exec_driver_sql(f"DROP SCHEMA {SCHEMA} CASCADE")
+
+
+if __name__ == "__main__":
+    main()
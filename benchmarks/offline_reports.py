@@ -0,0 +1,68 @@
+"""Every queries/ and queries/special/ report in Postgres vs offline_reports.py on a fresh snapshot.
+
+Exports the database at --url to a temporary snapshot, then checks each
+report returns the same rows both ways and times them.
+Run from the repo root:  python -m benchmarks.offline_reports [--runs 3]
+"""
+import argparse
+import numbers
+import os
+import tempfile
+import time
+from decimal import Decimal
+
+from dotenv import load_dotenv
+
+import db_schema
+import offline_reports
+import snapshot
+from query_bench import discover_queries
+
+
+def best_ms(runs, fn):
+    best, result = float("inf"), None
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000, result
+
+
+def normalise(rows):
+    """Numbers compared as floats to 4 places (SQL numerics vs float dollars); row order ignored."""
+    norm = lambda v: round(float(v), 4) if isinstance(v, (numbers.Number, Decimal)) else v
+    return sorted(tuple(norm(v) for v in row) for row in rows)
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--url", help="SQLAlchemy database URL (overrides DATABASE_URL env)")
+    p.add_argument("--runs", type=int, default=3)
+    args = p.parse_args()
+    load_dotenv()
+    engine = db_schema.get_engine(args.url or os.environ["DATABASE_URL"])
+    queries = discover_queries()
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        t0 = time.perf_counter()
+        snapshot.export(engine, out_dir)
+        print(f"export: {time.perf_counter() - t0:.2f}s\n")
+        t0 = time.perf_counter()
+        snap = snapshot.Snapshot(out_dir)
+        print(f"open snapshot: {(time.perf_counter() - t0) * 1000:.2f} ms\n")
+
+        print(f"{'report':<32}{'sql ms':>10}{'offline ms':>12}{'speedup':>9}  same result")
+        total_sql = total_offline = 0
+        for name, fn in offline_reports.REPORTS.items():
+            with engine.connect() as conn:
+                sql_ms, sql_rows = best_ms(args.runs, lambda: conn.exec_driver_sql(queries[name]).fetchall())
+            off_ms, frame = best_ms(args.runs, lambda: fn(snap))
+            same = normalise(sql_rows) == normalise(frame.itertuples(index=False))
+            total_sql += sql_ms
+            total_offline += off_ms
+            print(f"{name:<32}{sql_ms:>10.1f}{off_ms:>12.1f}{sql_ms / off_ms:>8.0f}x  {same}")
+        print(f"{'all reports':<32}{total_sql:>10.1f}{total_offline:>12.1f}{total_sql / total_offline:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""EXPLAIN ANALYZE time of every queries/ report without and with the secondary indexes.
+
+Needs a seeded database (DATABASE_URL or --url); the indexes are rebuilt at the end.
+Run from the repo root:  python -m benchmarks.query_indexes [--runs 3]
+"""
+import argparse
+import os
+
+from dotenv import load_dotenv
+from sqlalchemy import create_engine
+
+import db_schema
+from query_bench import discover_queries
+
+# Narrow lookups the dashboards run alongside the full-table reports.
+PROBES = {
+    "probe: orders on one day": "SELECT COUNT(*), SUM(total_amount) FROM orders "
+                                "WHERE order_date >= '2025-03-01' AND order_date < '2025-03-02'",
+    "probe: one cashier's revenue": "SELECT SUM(total_amount) FROM orders WHERE employee_id = 2",
+    "probe: one product's revenue": "SELECT SUM(quantity * unit_price_at_sale) FROM order_items WHERE product_id = 7",
+    "probe: items of one order": "SELECT * FROM order_items WHERE order_id = 123456",
+    "probe: recipes using mango": "SELECT product_id FROM product_recipe WHERE ingredient_id = 1",
+}
+
+
+def best_ms(engine, sql, runs):
+    """Best server execution time over runs, and the scan node types of the last plan."""
+    times = []
+    with engine.connect() as conn:
+        for _ in range(runs):
+            plan = conn.exec_driver_sql(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}").scalar()[0]
+            times.append(plan["Execution Time"])
+    return min(times), _scan_nodes(plan["Plan"])
+
+
+def _scan_nodes(node):
+    kinds = {node["Node Type"]} if "Scan" in node["Node Type"] else set()
+    for child in node.get("Plans", []):
+        kinds |= _scan_nodes(child)
+    return kinds
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--url", help="SQLAlchemy database URL (overrides DATABASE_URL env)")
+    p.add_argument("--runs", type=int, default=3)
+    args = p.parse_args()
+    load_dotenv()
+    engine = create_engine(args.url or os.environ["DATABASE_URL"])
+
+    sqls = discover_queries()
+    sqls.update(PROBES)
+
+    db_schema.drop_indexes(engine)
+    before = {name: best_ms(engine, sql, args.runs) for name, sql in sqls.items()}
+    db_schema.create_indexes(engine)
+    after = {name: best_ms(engine, sql, args.runs) for name, sql in sqls.items()}
+
+    print(f"{'query':<34}{'before ms':>11}{'after ms':>11}{'speedup':>9}  scans after")
+    for name in sqls:
+        b, _ = before[name]
+        a, scans = after[name]
+        print(f"{name:<34}{b:>11.1f}{a:>11.1f}{b / a if a else 0:>8.1f}x  {', '.join(sorted(scans))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Dashboard loads through ReportCache: cold, warm from memory, warm from disk, after a catalog change.
+
+Needs a seeded database. The catalog change is a no-op UPDATE on one
+product, which only bumps the products change counter.
+Run from the repo root:  python -m benchmarks.report_cache
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from dotenv import load_dotenv
+
+import db_schema
+import reports
+from query_bench import discover_queries
+from report_cache import ReportCache, tables_in
+
+
+def timed(label, fn, cache):
+    before = cache.stats()
+    t0 = time.perf_counter()
+    fn()
+    ms = (time.perf_counter() - t0) * 1000
+    after = cache.stats()
+    hits = after["memory_hits"] + after["disk_hits"] - before["memory_hits"] - before["disk_hits"]
+    misses = after["misses"] - before["misses"]
+    print(f"{label:<34}{ms:>10.1f}{hits:>7}{misses:>8}")
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--url", help="SQLAlchemy database URL (overrides DATABASE_URL env)")
+    args = p.parse_args()
+    load_dotenv()
+    engine = db_schema.get_engine(args.url or os.environ["DATABASE_URL"])
+    queries = discover_queries()
+    tables = {t for sql in queries.values() for t in tables_in(sql)}
+
+    with tempfile.TemporaryDirectory() as disk_dir:
+        cache = ReportCache(engine, disk_dir=disk_dir)
+        print(f"{len(queries)} reports over {len(tables)} tables\n")
+        print(f"{'load':<34}{'ms':>10}{'hits':>7}{'misses':>8}")
+        timed("cold", lambda: reports.run_reports(engine, queries, cache=cache), cache)
+        timed("warm (memory)", lambda: reports.run_reports(engine, queries, cache=cache), cache)
+        timed("watermark check alone", lambda: cache.watermarks(tables), cache)
+        disk_cache = ReportCache(engine, disk_dir=disk_dir)
+        timed("warm (disk, new process)", lambda: reports.run_reports(engine, queries, cache=disk_cache), disk_cache)
+        with engine.begin() as conn:
+            conn.exec_driver_sql("UPDATE products SET unit_price = unit_price WHERE product_id = 1")
+        timed("after a products change", lambda: reports.run_reports(engine, queries, cache=cache), cache)
+        stats = cache.stats()
+        print(f"\nhit rate over these loads: {stats['hit_rate']:.0%} ({stats['stale']} stale)")
+
+
+if __name__ == "__main__":
+    main()
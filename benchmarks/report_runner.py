@@ -0,0 +1,49 @@
+"""Dashboard wall time: every queries/ report one after another vs all at once through reports.py.
+
+Needs a seeded database. Concurrency only pays off with spare server cores;
+on a single core the concurrent run stays near the sequential sum.
+Run from the repo root:  python -m benchmarks.report_runner [--runs 3] [--pool-size 8]
+"""
+import argparse
+import os
+import time
+
+from dotenv import load_dotenv
+
+import db_schema
+import reports
+from query_bench import discover_queries
+
+
+def best_of(runs, fn):
+    best = float("inf")
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--url", help="SQLAlchemy database URL (overrides DATABASE_URL env)")
+    p.add_argument("--runs", type=int, default=3)
+    p.add_argument("--pool-size", type=int, default=8)
+    args = p.parse_args()
+    load_dotenv()
+    engine = db_schema.get_engine(args.url or os.environ["DATABASE_URL"], pool_size=args.pool_size)
+    queries = discover_queries()
+
+    reports.run_reports(engine, queries)  # warm the pool and the buffer cache
+    slowest = max((best_of(args.runs, lambda: reports.read_frame(engine, sql)), name) for name, sql in queries.items())
+    sequential = best_of(args.runs, lambda: reports.run_reports(engine, queries, concurrency=1))
+    concurrent = best_of(args.runs, lambda: reports.run_reports(engine, queries))
+
+    print(f"{len(queries)} reports, pool size {args.pool_size}, {os.cpu_count()} client CPU(s)")
+    print(f"slowest report alone   {slowest[0]:8.2f}s  ({slowest[1]})")
+    print(f"sequential             {sequential:8.2f}s")
+    print(f"concurrent             {concurrent:8.2f}s  {sequential / concurrent:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
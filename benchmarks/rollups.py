@@ -0,0 +1,64 @@
+"""Original reports vs their queries/rollups/ rewrites: same answers, and how long each takes.
+
+Needs a seeded database with refreshed rollups (db_schema.py --refresh-rollups).
+Run from the repo root:  python -m benchmarks.rollups [--runs 3]
+"""
+import argparse
+import os
+import time
+from decimal import Decimal
+
+from dotenv import load_dotenv
+from sqlalchemy import create_engine
+
+import db_schema
+from query_bench import QUERY_DIR
+
+
+def original_for(name):
+    for sub in ("", "special"):
+        path = os.path.join(QUERY_DIR, sub, name)
+        if os.path.exists(path):
+            return path
+
+
+def run(engine, path, runs):
+    sql = open(path, encoding="utf-8").read()
+    best = float("inf")
+    with engine.connect() as conn:
+        for _ in range(runs):
+            t0 = time.perf_counter()
+            rows = conn.exec_driver_sql(sql).fetchall()
+            best = min(best, time.perf_counter() - t0)
+    return best * 1000, rows
+
+
+def normalise(rows):
+    """Group order is unspecified in several reports, and averages differ past the cent."""
+    norm = lambda v: round(v, 6) if isinstance(v, Decimal) else v
+    return sorted(tuple(norm(v) for v in row) for row in rows)
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--url", help="SQLAlchemy database URL (overrides DATABASE_URL env)")
+    p.add_argument("--runs", type=int, default=3)
+    args = p.parse_args()
+    load_dotenv()
+    engine = create_engine(args.url or os.environ["DATABASE_URL"])
+
+    t0 = time.perf_counter()
+    n = db_schema.refresh_rollups(engine)
+    print(f"incremental refresh: {n} new orders in {(time.perf_counter() - t0) * 1000:.1f} ms\n")
+
+    print(f"{'query':<28}{'orders ms':>11}{'rollup ms':>11}{'speedup':>9}  same result")
+    rollup_dir = os.path.join(QUERY_DIR, "rollups")
+    for name in sorted(os.listdir(rollup_dir)):
+        orig_ms, orig_rows = run(engine, original_for(name), args.runs)
+        roll_ms, roll_rows = run(engine, os.path.join(rollup_dir, name), args.runs)
+        same = normalise(orig_rows) == normalise(roll_rows)
+        print(f"{name:<28}{orig_ms:>11.1f}{roll_ms:>11.1f}{orig_ms / roll_ms:>8.0f}x  {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Rows/sec of the order generator: the old per-row pandas loop vs the NumPy batch.
+
+Run from the repo root:  python -m benchmarks.seed_generation [--days 30]
+"""
+import argparse
+import random
+import time
+from datetime import timedelta
+
+import numpy as np
+
+import seeder
+
+
+def legacy_generate(df, start, days, orders_per_day):
+    """The original seeder.py loop, kept verbatim (minus file output) for comparison."""
+    orders_rows, order_items_rows = [], []
+    order_id, order_item_id = 1, 1
+    for d in range(days):
+        day = start + timedelta(days=d)
+        for _ in range(orders_per_day):
+            hour = random.randint(7, 20)
+            minute = random.randint(0, 59)
+            ts = day.replace(hour=hour, minute=minute, second=0)
+            num_lines = random.randint(1, 4)
+            order_total = 0.0
+            lines = []
+            for _ in range(num_lines):
+                prod = df.sample(n=1).iloc[0]
+                pid = int(prod["product_id"])
+                base_price = float(prod["unit_price"])
+                qty = random.randint(1, 5)
+                unit_price_at_sale = round(base_price, 2)
+                order_total += unit_price_at_sale * qty
+                lines.append((order_item_id, order_id, pid, qty, f"{unit_price_at_sale:.2f}"))
+                order_item_id += 1
+            orders_rows.append([order_id, ts.strftime("%Y-%m-%d %H:%M:%S"), f"{order_total:.2f}"])
+            for row in lines:
+                order_items_rows.append(list(row))
+            order_id += 1
+    return len(orders_rows) + len(order_items_rows)
+
+
+def vectorized_generate(menu, start, days, orders_per_day):
+    counts = np.full(days, orders_per_day, dtype=np.int64)
+    batch = seeder.generate_orders(menu, start, counts)
+    orders = list(seeder.order_rows(batch, start))
+    items = list(seeder.order_item_rows(batch, start))
+    return len(orders) + len(items)
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    rows = fn(*args)
+    return rows, time.perf_counter() - t0
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--days", type=int, default=30, help="days to generate for the legacy loop")
+    args = p.parse_args()
+
+    df = seeder.load_products()
+    _, _, menu = seeder.read_dataset()
+    per_day = int(seeder.plan_daily_orders(menu)[0])
+    random.seed(seeder.SEED)
+    legacy_rows, legacy_s = timed(legacy_generate, df, seeder.START_DATE, args.days, per_day)
+    # the batch path is fast enough to time on a full year
+    year = (seeder.END_DATE - seeder.START_DATE).days + 1
+    new_rows, new_s = timed(vectorized_generate, menu, seeder.START_DATE, year, per_day)
+
+    print(f"{'engine':<12}{'days':>6}{'rows':>10}{'seconds':>10}{'rows/s':>12}")
+    print(f"{'legacy':<12}{args.days:>6}{legacy_rows:>10}{legacy_s:>10.2f}{legacy_rows / legacy_s:>12,.0f}")
+    print(f"{'numpy':<12}{year:>6}{new_rows:>10}{new_s:>10.2f}{new_rows / new_s:>12,.0f}")
+    print(f"speedup: {(new_rows / new_s) / (legacy_rows / legacy_s):.0f}x")
+
+
+if __name__ == "__main__":
+    main()
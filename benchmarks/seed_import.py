@@ -0,0 +1,55 @@
+"""Cold-start cost of the seeder library: import time and a small seed, each in a fresh interpreter.
+
+Also checks that importing seeder loads no pandas and writes no files.
+Run from the repo root:  python -m benchmarks.seed_import [--runs 10]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CASES = {
+    "python startup": "pass",
+    "import numpy": "import numpy",
+    "import pandas (no longer needed)": "import pandas",
+    "import seeder": "import seeder",
+    "small seed: 1 week, $1k of sales": (
+        "from datetime import datetime\n"
+        "import seeder\n"
+        "config = seeder.Config(end=datetime(2024, 10, 2), sales_target=1000)\n"
+        "sum(len(b.rows) for b in seeder.generate(config))"
+    ),
+}
+
+
+def run(code, cwd):
+    env = {**os.environ, "PYTHONPATH": ROOT}
+    t0 = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], cwd=cwd, env=env, check=True)
+    return time.perf_counter() - t0
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--runs", type=int, default=10)
+    args = p.parse_args()
+
+    with tempfile.TemporaryDirectory() as cwd:
+        run("import seeder", cwd)  # warm the OS file cache and __pycache__
+        print(f"{'':<36}{'best ms':>9}{'median ms':>11}")
+        for label, code in CASES.items():
+            times = [run(code, cwd) * 1000 for _ in range(args.runs)]
+            print(f"{label:<36}{min(times):>9.0f}{statistics.median(times):>11.0f}")
+        loaded = subprocess.run([sys.executable, "-c", "import sys, seeder; print('pandas' in sys.modules)"],
+                                cwd=cwd, env={**os.environ, "PYTHONPATH": ROOT},
+                                check=True, capture_output=True, text=True).stdout.strip()
+        print(f"\nimport seeder loads pandas: {loaded}; files written on import: {os.listdir(cwd) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
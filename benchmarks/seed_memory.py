@@ -0,0 +1,43 @@
+"""Peak RSS of seeder.py across date ranges and sales targets; it should stay flat.
+
+Run from the repo root:  python -m benchmarks.seed_memory
+"""
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+SEEDER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "seeder.py")
+
+RUNS = [
+    ("2024-09-26", "2025-09-26", 1_000_000),
+    ("2021-01-01", "2025-12-31", 5_000_000),
+    ("2021-01-01", "2025-12-31", 50_000_000),
+    ("2021-01-01", "2025-12-31", 250_000_000),
+]
+
+
+def run(start, end, target, out_dir):
+    out = subprocess.run(
+        [sys.executable, SEEDER, "--start", start, "--end", end,
+         "--sales-target", str(target), "--out-dir", out_dir],
+        cwd=out_dir, check=True, capture_output=True, text=True,
+    ).stdout
+    # peak RSS is per process, so the counts come from the summary line rather than seeder.generate()
+    m = re.search(r"(\d+) orders / (\d+) order items / (\d+) modifications in ([\d.]+)s, peak RSS ([\d.]+) MB", out)
+    if m is None:
+        raise RuntimeError(f"unexpected seeder.py output: {out!r}")
+    return int(m.group(1)), int(m.group(2)), int(m.group(3)), float(m.group(4)), float(m.group(5))
+
+
+def main():
+    print(f"{'range':<24}{'target':>14}{'orders':>12}{'items':>12}{'mods':>10}{'seconds':>10}{'peak MB':>10}")
+    with tempfile.TemporaryDirectory() as out_dir:
+        for start, end, target in RUNS:
+            orders, items, mods, secs, rss = run(start, end, target, out_dir)
+            print(f"{start + '..' + end:<24}{target:>14,}{orders:>12,}{items:>12,}{mods:>10,}{secs:>10.2f}{rss:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
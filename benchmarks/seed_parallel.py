@@ -0,0 +1,47 @@
+"""Wall time of seeder.py with 1 vs N generator processes, and a check that the output is identical.
+
+Run from the repo root:  python -m benchmarks.seed_parallel [--workers 1 2 4] [--sales-target 50000000]
+"""
+import argparse
+import hashlib
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+SEEDER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "seeder.py")
+
+
+def digest(out_dir):
+    """sha256 over every stage CSV seeder.py wrote (employees, catalog, orders, items and modifications)."""
+    h = hashlib.sha256()
+    for name in sorted(f for f in os.listdir(out_dir) if f.endswith("_stage.csv")):
+        with open(os.path.join(out_dir, name), "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+    return h.hexdigest()[:16]
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    p.add_argument("--sales-target", type=float, default=50_000_000)
+    args = p.parse_args()
+
+    print(f"cpus: {os.cpu_count()}")
+    print(f"{'workers':>8}{'seconds':>10}{'speedup':>9}  sha256")
+    base = None
+    with tempfile.TemporaryDirectory() as out_dir:
+        for workers in sorted(set(args.workers)):
+            t0 = time.perf_counter()
+            subprocess.run([sys.executable, SEEDER, "--workers", str(workers), "--sales-target",
+                            str(args.sales_target), "--out-dir", out_dir],
+                           cwd=out_dir, check=True, capture_output=True)
+            secs = time.perf_counter() - t0
+            base = base or secs
+            print(f"{workers:>8}{secs:>10.2f}{base / secs:>8.2f}x  {digest(out_dir)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Staging files as CSV vs gzip'd binary COPY artifacts: write time, size on disk and load time.
+
+Generates the same data both ways, then COPYs each set into the staging
+tables of a throwaway schema (best of --runs), so existing data is untouched.
+Run from the repo root:  python -m benchmarks.stage_artifacts [--scale-factor 5]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from dotenv import load_dotenv
+from sqlalchemy import create_engine
+
+import artifacts
+import seeder
+
+SCHEMA = "artifact_bench"
+
+
+def write_csv(out_dir, cat, employees, menu, counts):
+    seeder.write_catalog_stages(cat, employees, out_dir)
+    seeder.write_order_stages(seeder.iter_stage_chunks(menu, seeder.START_DATE, counts), out_dir)
+    return sum(os.path.getsize(seeder.stage_path(t[:-len("_stage")], out_dir)) for t in seeder.STAGE_TABLES)
+
+
+def write_binary(out_dir, cat, employees, menu, counts):
+    chunks = seeder.iter_stage_chunks(menu, seeder.START_DATE, counts, fmt="binary")
+    seeder.write_binary_stages(cat, employees, chunks, out_dir)
+    return sum(entry["compressed_bytes"] for entry in artifacts.read_manifest(out_dir)["tables"].values())
+
+
+def load_csv(cur, out_dir):
+    for table, columns in seeder.STAGE_COLUMNS.items():
+        with open(seeder.stage_path(table[:-len("_stage")], out_dir), encoding="utf-8") as f:
+            cur.copy_expert(f"COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv, HEADER)", f, size=artifacts.READ_SIZE)
+
+
+def load_binary(cur, out_dir):
+    for table, entry in artifacts.read_manifest(out_dir)["tables"].items():
+        artifacts.copy_artifact(cur, table, out_dir, entry)
+
+
+def best_load(engine, fn, out_dir, runs):
+    best = float("inf")
+    for _ in range(runs):
+        conn = engine.raw_connection()
+        try:
+            with conn.cursor() as cur:
+                cur.execute(f"TRUNCATE {', '.join(seeder.STAGE_TABLES)}")
+                conn.commit()
+                t0 = time.perf_counter()
+                fn(cur, out_dir)
+                conn.commit()
+                best = min(best, time.perf_counter() - t0)
+        finally:
+            conn.close()
+    return best
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--url", help="SQLAlchemy database URL (overrides DATABASE_URL env)")
+    p.add_argument("--scale-factor", type=float, default=5.0)
+    p.add_argument("--runs", type=int, default=3)
+    args = p.parse_args()
+    load_dotenv()
+    url = args.url or os.environ["DATABASE_URL"]
+
+    cat, employees, menu = seeder.read_dataset(args.scale_factor)
+    counts = seeder.plan_daily_orders(menu)
+    admin = create_engine(url)
+    with admin.begin() as conn:
+        conn.exec_driver_sql(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        conn.exec_driver_sql(f"CREATE SCHEMA {SCHEMA}")
+        for table in seeder.STAGE_TABLES:
+            conn.exec_driver_sql(f"CREATE UNLOGGED TABLE {SCHEMA}.{table} ({seeder.STAGE_TABLES[table]})")
+    engine = create_engine(url, connect_args={"options": f"-csearch_path={SCHEMA}"})
+
+    try:
+        with tempfile.TemporaryDirectory() as csv_dir, tempfile.TemporaryDirectory() as bin_dir:
+            print(f"scale factor {args.scale_factor:g}: {int(counts.sum())} planned orders\n")
+            print(f"{'route':<26}{'write s':>9}{'MB':>9}{'load s':>9}")
+            results = {}
+            for label, write, load, out_dir in (("CSV", write_csv, load_csv, csv_dir),
+                                                ("binary COPY + gzip", write_binary, load_binary, bin_dir)):
+                t0 = time.perf_counter()
+                size = write(out_dir, cat, employees, menu, counts)
+                write_s = time.perf_counter() - t0
+                load_s = best_load(engine, load, out_dir, args.runs)
+                results[label] = (size, load_s)
+                print(f"{label:<26}{write_s:>9.2f}{size / 2**20:>9.1f}{load_s:>9.2f}")
+            (csv_size, csv_s), (bin_size, bin_s) = results.values()
+            raw = sum(e["bytes"] for e in artifacts.read_manifest(bin_dir)["tables"].values())
+            print(f"\nbinary artifacts: {csv_size / bin_size:.1f}x smaller ({raw / 2**20:.1f} MB uncompressed), "
+                  f"{csv_s / bin_s:.1f}x faster to load")
+    finally:
+        engine.dispose()
+        with admin.begin() as conn:
+            conn.exec_driver_sql(f"DROP SCHEMA {SCHEMA} CASCADE")
+
+
+if __name__ == "__main__":
+    main()
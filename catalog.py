@@ -0,0 +1,216 @@
+"""Menu catalog (products, inventory, recipes) read from CSV and bulk-upserted.
+
+data.csv       name,price,fruit,tea[,product_id]  - one row per product; its fruit
+                                                    and tea are recipe lines of 1 unit
+inventory.csv  ingredient_name,on_hand_quantity[,ingredient_id]
+recipes.csv    product_name,ingredient_name,quantity_per_unit - every other recipe line
+shifts.csv     shift,start,end                     - shift windows (HH:MM), which may overlap
+roster.csv     employee_id,shift,days              - who works which shift on which days of one
+                                                    store's week (days like Mon-Fri or Sat,Sun)
+
+Ids default to row order (1-based), matching what the seeder assumes.
+
+scale(), scale_employees() and scale_roster() grow the base catalog and staff for
+seeder.py --scale-factor: every extra whole unit of scale is one more
+store with its own copy of the menu, ingredients, recipes and staff, and a
+fractional part adds none (2.5 is two stores; below 2, one).
+"""
+import os
+import io
+import csv
+from decimal import Decimal
+from typing import NamedTuple
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PRODUCTS_CSV = os.path.join(BASE_DIR, 'data.csv')
+INVENTORY_CSV = os.path.join(BASE_DIR, 'inventory.csv')
+RECIPES_CSV = os.path.join(BASE_DIR, 'recipes.csv')
+SHIFTS_CSV = os.path.join(BASE_DIR, 'shifts.csv')
+ROSTER_CSV = os.path.join(BASE_DIR, 'roster.csv')
+
+TEA_NAMES = {'milk': 'milk tea', 'green': 'green tea'}
+WEEKDAYS = ('mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun')  # datetime.weekday() order
+
+# the staff of one store: (employee_id, name, role)
+EMPLOYEES = [
+    (1, 'Andre Athari', 'Cashier'),
+    (2, 'Raafay Hemani', 'Cashier'),
+    (3, 'Liam Alme', 'Manager'),
+    (4, 'Matthew Jones', 'Cashier'),
+    (5, 'Sam Maharjan', 'Cashier'),
+]
+
+
+class Catalog(NamedTuple):
+    products: list   # (product_id, product_name, unit_price)
+    inventory: list  # (ingredient_id, ingredient_name, on_hand_quantity)
+    recipes: list    # (product_id, ingredient_id, quantity_per_unit)
+
+
+def _read(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        return [{k.strip(): (v or '').strip() for k, v in row.items()} for row in csv.DictReader(f)]
+
+
+def read_products(path=PRODUCTS_CSV):
+    """Rows of data.csv as dicts with product_id, product_name, unit_price (Decimal), fruit and tea."""
+    products = []
+    for n, row in enumerate(_read(path), start=1):
+        tea = row.get('tea', '').lower()
+        products.append({
+            'product_id': int(row.get('product_id') or n),
+            'product_name': row.get('product_name') or row['name'],
+            'unit_price': Decimal((row.get('unit_price') or row['price']).replace('$', '')),
+            'fruit': row.get('fruit', '').lower(),
+            'tea': TEA_NAMES.get(tea, tea),
+        })
+    return products
+
+
+def read_catalog(products_csv=PRODUCTS_CSV, inventory_csv=INVENTORY_CSV, recipes_csv=RECIPES_CSV):
+    products = read_products(products_csv)
+    inventory = [
+        (int(row.get('ingredient_id') or n), row['ingredient_name'], Decimal(row['on_hand_quantity']))
+        for n, row in enumerate(_read(inventory_csv), start=1)
+    ]
+    product_ids = {p['product_name'].lower(): p['product_id'] for p in products}
+    ingredient_ids = {name.lower(): iid for iid, name, _ in inventory}
+
+    recipes = {}
+    for p in products:
+        for ingredient in (p['fruit'], p['tea']):
+            if ingredient:
+                recipes[p['product_id'], ingredient_ids[ingredient]] = Decimal(1)
+    if os.path.exists(recipes_csv):
+        for row in _read(recipes_csv):
+            key = product_ids[row['product_name'].lower()], ingredient_ids[row['ingredient_name'].lower()]
+            recipes[key] = Decimal(row['quantity_per_unit'])
+
+    return Catalog(
+        [(p['product_id'], p['product_name'], p['unit_price']) for p in products],
+        inventory,
+        [(pid, iid, qty) for (pid, iid), qty in recipes.items()],
+    )
+
+
+def stores(factor):
+    """Whole stores in a dataset of the given scale factor: its whole part, and at least one."""
+    return max(1, int(factor))
+
+
+def scale(catalog, factor):
+    """The catalog with stores(factor) copies of every product, ingredient and recipe line.
+
+    Store 1 is the catalog itself; store k's rows get ids offset by (k - 1)
+    times the largest id and names suffixed ' #k', and its recipes use its
+    own ingredients, so the ratios between the tables stay fixed.
+    """
+    n = stores(factor)
+    product_step = max(pid for pid, _, _ in catalog.products)
+    ingredient_step = max(iid for iid, _, _ in catalog.inventory)
+    suffix = lambda k: '' if k == 0 else f' #{k + 1}'
+    return Catalog(
+        [(pid + k * product_step, name + suffix(k), price)
+         for k in range(n) for pid, name, price in catalog.products],
+        [(iid + k * ingredient_step, name + suffix(k), qty)
+         for k in range(n) for iid, name, qty in catalog.inventory],
+        [(pid + k * product_step, iid + k * ingredient_step, qty)
+         for k in range(n) for pid, iid, qty in catalog.recipes],
+    )
+
+
+def scale_employees(factor, employees=EMPLOYEES):
+    """EMPLOYEES for each of stores(factor) stores, numbered the same way as scale()."""
+    step = max(eid for eid, _, _ in employees)
+    return [(eid + k * step, name if k == 0 else f'{name} #{k + 1}', role)
+            for k in range(stores(factor)) for eid, name, role in employees]
+
+
+def _minute(hhmm):
+    hours, minutes = hhmm.split(':')
+    return int(hours) * 60 + int(minutes)
+
+
+def _weekdays(days):
+    """'Mon-Fri' or 'Sat,Sun' -> the weekday() numbers it covers."""
+    picked = set()
+    for part in days.lower().split(','):
+        first, _, last = part.strip().partition('-')
+        lo, hi = WEEKDAYS.index(first[:3]), WEEKDAYS.index((last or first)[:3])
+        picked.update(range(lo, hi + 1) if lo <= hi else [*range(lo, 7), *range(hi + 1)])
+    return tuple(sorted(picked))
+
+
+def read_roster(shifts_csv=SHIFTS_CSV, roster_csv=ROSTER_CSV):
+    """One store's weekly roster: (employee_id, start minute, end minute, weekdays) per roster.csv line."""
+    shifts = {row['shift'].lower(): (_minute(row['start']), _minute(row['end'])) for row in _read(shifts_csv)}
+    return [(int(row['employee_id']), *shifts[row['shift'].lower()], _weekdays(row['days']))
+            for row in _read(roster_csv)]
+
+
+def scale_roster(roster, factor, employees=EMPLOYEES):
+    """The roster repeated for each of stores(factor) stores, with employee ids numbered as scale_employees()."""
+    step = max(eid for eid, _, _ in employees)
+    return [(eid + k * step, start, end, days)
+            for k in range(stores(factor)) for eid, start, end, days in roster]
+
+
+# target table -> (columns, conflict key); every other column not in KEEP_ON_CONFLICT is updated on conflict
+UPSERTS = {
+    'inventory': (('ingredient_id', 'ingredient_name', 'on_hand_quantity'), ('ingredient_id',)),
+    'products': (('product_id', 'product_name', 'unit_price'), ('product_id',)),
+    'product_recipe': (('product_id', 'ingredient_id', 'quantity_per_unit'), ('product_id', 'ingredient_id')),
+}
+# columns an existing row keeps: stock levels belong to the depletion ledger once loaded
+KEEP_ON_CONFLICT = {'inventory': ('on_hand_quantity',)}
+SEQUENCES = {'inventory': ('inventory_ingredient_id_seq', 'ingredient_id'),
+             'products': ('products_product_id_seq', 'product_id')}
+
+
+def _updated_columns(table):
+    columns, key = UPSERTS[table]
+    return [c for c in columns if c not in key and c not in KEEP_ON_CONFLICT.get(table, ())]
+
+
+def _upsert_sql(table, source):
+    columns, key = UPSERTS[table]
+    updates = ', '.join(f'{c} = EXCLUDED.{c}' for c in _updated_columns(table))
+    return (f'INSERT INTO {table} ({", ".join(columns)}) SELECT {", ".join(columns)} FROM {source} '
+            f'ON CONFLICT ({", ".join(key)}) DO UPDATE SET {updates}')
+
+
+def _copy_upsert(conn, table, rows):
+    """COPY rows into a temp table, then upsert them in one statement."""
+    columns, _ = UPSERTS[table]
+    buf = io.StringIO()
+    csv.writer(buf).writerows(rows)
+    buf.seek(0)
+    conn.exec_driver_sql(f'CREATE TEMP TABLE {table}_in (LIKE {table}) ON COMMIT DROP')
+    with conn.connection.dbapi_connection.cursor() as cur:
+        cur.copy_expert(f'COPY {table}_in ({", ".join(columns)}) FROM STDIN WITH (FORMAT csv)', buf)
+    conn.exec_driver_sql(_upsert_sql(table, f'{table}_in'))
+
+
+def _insert_upsert(conn, table, rows):
+    """Core multi-row INSERT ... ON CONFLICT (SQLAlchemy batches the VALUES lists)."""
+    # imported here so reading the CSVs (e.g. from seeder.py) doesn't need SQLAlchemy
+    from sqlalchemy import table as sa_table, column
+    from sqlalchemy.dialects.postgresql import insert
+
+    columns, key = UPSERTS[table]
+    target = sa_table(table, *(column(c) for c in columns))
+    stmt = insert(target)
+    stmt = stmt.on_conflict_do_update(index_elements=list(key),
+                                      set_={c: stmt.excluded[c] for c in _updated_columns(table)})
+    conn.execute(stmt, [dict(zip(columns, row)) for row in rows])
+
+
+def load_catalog(conn, catalog, method='copy'):
+    """Upsert a Catalog inside the caller's transaction; method is 'copy' or 'insert'."""
+    upsert = _copy_upsert if method == 'copy' else _insert_upsert
+    upsert(conn, 'inventory', catalog.inventory)
+    upsert(conn, 'products', catalog.products)
+    upsert(conn, 'product_recipe', catalog.recipes)
+    # explicit ids bypass the sequences; keep them ahead for later inserts
+    for table, (seq, col) in SEQUENCES.items():
+        conn.exec_driver_sql(f"SELECT setval('{seq}', (SELECT COALESCE(MAX({col}), 0) + 1 FROM {table}), false)")
@@ -1,5 +1,8 @@
 import os
 import argparse
+import functools
+import uuid
+from datetime import date
 from dotenv import load_dotenv
 from sqlalchemy import (
     create_engine,
@@ -7,13 +10,27 @@ from sqlalchemy import (
     Integer,
     String,
     DateTime,
+    Date,
+    SmallInteger,
+    BigInteger,
     Numeric,
     ForeignKey,
+    ForeignKeyConstraint,
     PrimaryKeyConstraint,
+    UniqueConstraint,
+    MetaData,
+    Table,
+    Index,
+    inspect,
+    text,
     Enum as SAEnum,
+    event,
 )
+from sqlalchemy.schema import CreateTable, AddConstraint
 from sqlalchemy.orm import declarative_base, relationship, sessionmaker
 
+from catalog import EMPLOYEES, read_catalog, load_catalog
+
 Base = declarative_base()
 
 
@@ -42,6 +59,15 @@ class Order(Base):
     total_amount = Column(Numeric(10, 2), nullable=False)
     employee_id = Column(Integer, ForeignKey('employees.employee_id'), nullable=False)
 
+    __table_args__ = (
+        # target of order_items' (order_id, order_date) foreign key; the primary key when partitioned
+        UniqueConstraint('order_id', 'order_date', name='uq_orders_order_id_order_date'),
+        # orders are inserted in date order, so a BRIN range map stays tiny and still prunes date ranges
+        Index('ix_orders_order_date_brin', 'order_date', postgresql_using='brin'),
+        # cashierPerformance/firableEmployees: index-only scan per cashier
+        Index('ix_orders_employee_id', 'employee_id', postgresql_include=['total_amount']),
+    )
+
     employee = relationship('Employee', back_populates='orders')
     items = relationship('OrderItem', back_populates='order', cascade='all, delete-orphan')
 
@@ -77,6 +103,8 @@ class ProductRecipe(Base):
 
     __table_args__ = (
         PrimaryKeyConstraint('product_id', 'ingredient_id', name='pk_product_recipe'),
+        # top10Ingredients joins from the ingredient side; the PK only leads with product_id
+        Index('ix_product_recipe_ingredient_id', 'ingredient_id', postgresql_include=['product_id', 'quantity_per_unit']),
     )
 
     product = relationship('Product', back_populates='recipe')
@@ -87,16 +115,32 @@ class OrderItem(Base):
     __tablename__ = 'order_items'
 
     order_item_id = Column(Integer, primary_key=True)
-    order_id = Column(Integer, ForeignKey('orders.order_id'), nullable=False)
+    order_id = Column(Integer, nullable=False)
+    # copy of orders.order_date, held to it by the foreign key; the partition key when created with --partitioned
+    order_date = Column(DateTime, nullable=False)
     product_id = Column(Integer, ForeignKey('products.product_id'), nullable=False)
     quantity = Column(Integer, nullable=False)
     unit_price_at_sale = Column(Numeric(10, 2), nullable=False)
 
+    __table_args__ = (
+        ForeignKeyConstraint(['order_id', 'order_date'], ['orders.order_id', 'orders.order_date'],
+                             name='fk_order_items_order'),
+        Index('ix_order_items_order_id', 'order_id'),
+        # top10ProdcutsSold/top10ProductsByRevenue: index-only scan grouped by product
+        Index('ix_order_items_product_id', 'product_id', postgresql_include=['quantity', 'unit_price_at_sale']),
+    )
+
     order = relationship('Order', back_populates='items')
     product = relationship('Product', back_populates='order_items')
     modifications = relationship('Modification', back_populates='order_item', cascade='all, delete-orphan')
 
 
+@event.listens_for(OrderItem, 'before_insert')
+def _copy_order_date(mapper, connection, item):
+    if item.order_date is None and item.order is not None:
+        item.order_date = item.order.order_date
+
+
 class Modification(Base):
     __tablename__ = 'modifications'
 
@@ -107,196 +151,517 @@ class Modification(Base):
     quantity_change = Column(Numeric(10, 1), nullable=True)
     price_change = Column(Numeric(10, 2), nullable=True)
 
+    __table_args__ = (
+        Index('ix_modifications_order_item_id', 'order_item_id'),
+        Index('ix_modifications_ingredient_id', 'ingredient_id'),
+    )
+
     order_item = relationship('OrderItem', back_populates='modifications')
     ingredient = relationship('Inventory', back_populates='modifications')
 
 
-def create_db(url: str):
+# --- Sales rollups ---
+# Pre-aggregated copies of orders/order_items for the reporting queries in
+# queries/rollups/. They only ever grow: refresh_rollups() folds in orders
+# newer than the stored high-water mark, up to the newest id below which
+# every order has committed.
+
+class SalesHourly(Base):
+    __tablename__ = 'sales_hourly'
+
+    sale_date = Column(Date, nullable=False)
+    sale_hour = Column(SmallInteger, nullable=False)
+    orders_count = Column(BigInteger, nullable=False)
+    revenue = Column(Numeric(14, 2), nullable=False)
+
+    __table_args__ = (
+        PrimaryKeyConstraint('sale_date', 'sale_hour', name='pk_sales_hourly'),
+    )
+
+
+class ProductSalesDaily(Base):
+    __tablename__ = 'product_sales_daily'
+
+    sale_date = Column(Date, nullable=False)
+    product_id = Column(Integer, ForeignKey('products.product_id'), nullable=False)
+    units_sold = Column(BigInteger, nullable=False)
+    revenue = Column(Numeric(14, 2), nullable=False)
+
+    __table_args__ = (
+        PrimaryKeyConstraint('sale_date', 'product_id', name='pk_product_sales_daily'),
+    )
+
+
+class RollupWatermark(Base):
+    __tablename__ = 'rollup_watermarks'
+
+    rollup_name = Column(String, primary_key=True)
+    last_order_id = Column(Integer, nullable=False)
+
+
+ROLLUP_REFRESH_SQL = [
+    """
+    INSERT INTO sales_hourly (sale_date, sale_hour, orders_count, revenue)
+    SELECT order_date::date, EXTRACT(HOUR FROM order_date), COUNT(*), SUM(total_amount)
+    FROM orders
+    WHERE order_id > :since AND order_id <= :upto
+    GROUP BY 1, 2
+    ON CONFLICT (sale_date, sale_hour) DO UPDATE
+    SET orders_count = sales_hourly.orders_count + EXCLUDED.orders_count,
+        revenue = sales_hourly.revenue + EXCLUDED.revenue
+    """,
+    """
+    INSERT INTO product_sales_daily (sale_date, product_id, units_sold, revenue)
+    SELECT o.order_date::date, oi.product_id, SUM(oi.quantity), SUM(oi.quantity * oi.unit_price_at_sale)
+    FROM orders o
+    JOIN order_items oi ON oi.order_id = o.order_id
+    WHERE o.order_id > :since AND o.order_id <= :upto
+    GROUP BY 1, 2
+    ON CONFLICT (sale_date, product_id) DO UPDATE
+    SET units_sold = product_sales_daily.units_sold + EXCLUDED.units_sold,
+        revenue = product_sales_daily.revenue + EXCLUDED.revenue
+    """,
+]
+
+
+def committed_order_horizon(engine):
+    """The highest order id such that every order at or below it has committed.
+
+    Sequence ids are handed out before commit, so with concurrent writers a
+    lower id can commit after MAX(order_id) was read. A SHARE lock waits out
+    every transaction already writing orders and holds new ones back until
+    MAX is read, so later orders get higher ids. The lock is held only for
+    that read.
+    """
+    with engine.begin() as conn:
+        conn.execute(text("LOCK TABLE orders IN SHARE MODE"))
+        return conn.execute(text("SELECT COALESCE(MAX(order_id), 0) FROM orders")).scalar()
+
+
+def refresh_rollups(engine, rebuild=False):
+    """Fold orders newer than the high-water mark into the rollup tables.
+
+    Orders are append-only and ids come from a sequence, so everything past
+    the mark and up to committed_order_horizon() is new and complete. An
+    order's items must be committed with the order. Returns the number of
+    orders processed.
+    """
+    upto = committed_order_horizon(engine)
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO rollup_watermarks (rollup_name, last_order_id) VALUES ('sales', 0) "
+            "ON CONFLICT (rollup_name) DO NOTHING"
+        ))
+        # the row lock serialises concurrent refreshes
+        since = conn.execute(text(
+            "SELECT last_order_id FROM rollup_watermarks WHERE rollup_name = 'sales' FOR UPDATE"
+        )).scalar()
+        if rebuild:
+            conn.execute(text("TRUNCATE sales_hourly, product_sales_daily"))
+            since = 0
+        if upto > since:
+            for sql in ROLLUP_REFRESH_SQL:
+                conn.execute(text(sql), {'since': since, 'upto': upto})
+        conn.execute(text("UPDATE rollup_watermarks SET last_order_id = :upto WHERE rollup_name = 'sales'"),
+                     {'upto': max(upto, since)})
+    return max(upto - since, 0)
+
+
+# --- Inventory depletion ---
+# Sold items are expanded through their recipes and modifications into a
+# per-day ingredient ledger, and inventory.on_hand_quantity is decremented
+# by the same amounts. It goes negative when sales outrun stock, so the
+# shortfall stays visible (queries/depletion/noSupply.sql).
+#
+# Per unit of an order item, an ingredient's use is its recipe quantity,
+# plus quantity_change for each ADD/EXTRA and minus it for each LESS (never
+# below zero); REMOVE drops the ingredient. A NULL quantity_change means one
+# recipe portion, or 1 for an ingredient that isn't in the recipe.
+
+class IngredientUsageDaily(Base):
+    __tablename__ = 'ingredient_usage_daily'
+
+    usage_date = Column(Date, nullable=False)
+    ingredient_id = Column(Integer, ForeignKey('inventory.ingredient_id'), nullable=False)
+    quantity_used = Column(Numeric(14, 1), nullable=False)
+
+    __table_args__ = (
+        PrimaryKeyConstraint('usage_date', 'ingredient_id', name='pk_ingredient_usage_daily'),
+        # top10Ingredients: index-only scan grouped by ingredient
+        Index('ix_ingredient_usage_daily_ingredient_id', 'ingredient_id', postgresql_include=['quantity_used']),
+    )
+
+
+DEPLETE_SQL = """
+WITH items AS (
+    SELECT order_item_id, order_date::date AS usage_date, product_id, quantity
+    FROM order_items
+    WHERE order_id > :since AND order_id <= :upto
+),
+recipe_lines AS (
+    SELECT i.order_item_id, i.usage_date, i.quantity, pr.ingredient_id, pr.quantity_per_unit AS base
+    FROM items i
+    JOIN product_recipe pr ON pr.product_id = i.product_id
+),
+mods AS (
+    SELECT m.order_item_id, i.usage_date, i.quantity, m.ingredient_id,
+           bool_or(m.modification_type = 'REMOVE') AS removed,
+           SUM(CASE m.modification_type WHEN 'LESS' THEN -1 WHEN 'REMOVE' THEN 0 ELSE 1 END
+               * m.quantity_change) AS fixed,
+           SUM(CASE WHEN m.quantity_change IS NOT NULL THEN 0
+                    WHEN m.modification_type = 'LESS' THEN -1
+                    WHEN m.modification_type = 'REMOVE' THEN 0 ELSE 1 END) AS portions
+    FROM modifications m
+    JOIN items i ON i.order_item_id = m.order_item_id
+    GROUP BY m.order_item_id, i.usage_date, i.quantity, m.ingredient_id
+),
+batch AS (
+    SELECT COALESCE(r.usage_date, m.usage_date) AS usage_date,
+           COALESCE(r.ingredient_id, m.ingredient_id) AS ingredient_id,
+           SUM(COALESCE(r.quantity, m.quantity)
+               * GREATEST(0, COALESCE(r.base, 0) + COALESCE(m.fixed, 0)
+                             + COALESCE(m.portions, 0) * COALESCE(r.base, 1))) AS quantity_used
+    FROM recipe_lines r
+    FULL JOIN mods m ON m.order_item_id = r.order_item_id AND m.ingredient_id = r.ingredient_id
+    WHERE m.removed IS NOT TRUE
+    GROUP BY 1, 2
+),
+ledger AS (
+    INSERT INTO ingredient_usage_daily (usage_date, ingredient_id, quantity_used)
+    SELECT usage_date, ingredient_id, quantity_used FROM batch
+    ON CONFLICT (usage_date, ingredient_id) DO UPDATE
+    SET quantity_used = ingredient_usage_daily.quantity_used + EXCLUDED.quantity_used
+)
+UPDATE inventory inv
+SET on_hand_quantity = inv.on_hand_quantity - t.quantity_used
+FROM (SELECT ingredient_id, SUM(quantity_used) AS quantity_used FROM batch GROUP BY ingredient_id) t
+WHERE inv.ingredient_id = t.ingredient_id
+"""
+
+
+def deplete_inventory(engine, batch_orders=250_000, rebuild=False):
+    """Take the ingredients of orders past the 'inventory' watermark out of stock.
+
+    Each batch of order ids is one statement and one transaction, with the
+    watermark moved in the same transaction. It stops at
+    committed_order_horizon(), so an order that commits late is depleted by
+    a later run instead of being skipped. rebuild first puts everything in
+    the ledger back on the shelf and replays all orders. Returns the number
+    of orders processed.
+    """
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO rollup_watermarks (rollup_name, last_order_id) VALUES ('inventory', 0) "
+            "ON CONFLICT (rollup_name) DO NOTHING"
+        ))
+        if rebuild:
+            conn.execute(text("SELECT 1 FROM rollup_watermarks WHERE rollup_name = 'inventory' FOR UPDATE"))
+            conn.execute(text(
+                "UPDATE inventory inv SET on_hand_quantity = inv.on_hand_quantity + t.quantity_used "
+                "FROM (SELECT ingredient_id, SUM(quantity_used) AS quantity_used "
+                "      FROM ingredient_usage_daily GROUP BY ingredient_id) t "
+                "WHERE inv.ingredient_id = t.ingredient_id"
+            ))
+            conn.execute(text("TRUNCATE ingredient_usage_daily"))
+            conn.execute(text("UPDATE rollup_watermarks SET last_order_id = 0 WHERE rollup_name = 'inventory'"))
+    upto = committed_order_horizon(engine)
+
+    done = 0
+    while True:
+        with engine.begin() as conn:
+            # the row lock serialises concurrent runs
+            since = conn.execute(text(
+                "SELECT last_order_id FROM rollup_watermarks WHERE rollup_name = 'inventory' FOR UPDATE"
+            )).scalar()
+            if since >= upto:
+                return done
+            batch_upto = min(since + batch_orders, upto)
+            conn.execute(text(DEPLETE_SQL), {'since': since, 'upto': batch_upto})
+            conn.execute(text("UPDATE rollup_watermarks SET last_order_id = :upto WHERE rollup_name = 'inventory'"),
+                         {'upto': batch_upto})
+            done += batch_upto - since
+
+
+# --- Change tracking for cached reports ---
+# Every table except the append-only, row-at-a-time ones gets a statement-level
+# trigger that bumps its row in change_counters; the bump commits (or rolls
+# back) with the change. orders, order_items and modifications are written
+# by every sale, where one shared counter row would serialise the cashiers,
+# so readers use their max id instead (report_cache.py); only DELETE and
+# TRUNCATE, which can lower or keep the max id, bump their counters.
+# schema_instance holds a fresh nonce each time the tables are created, so a
+# rebuilt database never matches results cached from the old one.
+
+class ChangeCounter(Base):
+    __tablename__ = 'change_counters'
+
+    table_name = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False)
+
+
+class SchemaInstance(Base):
+    __tablename__ = 'schema_instance'
+
+    instance_id = Column(String, primary_key=True)
+
+
+APPEND_ONLY_IDS = {'orders': 'order_id', 'order_items': 'order_item_id', 'modifications': 'modification_id'}
+UNTRACKED_TABLES = {'change_counters', 'rollup_watermarks', 'schema_instance'}
+
+BUMP_CHANGE_COUNTER_SQL = (
+    "INSERT INTO change_counters (table_name, version) VALUES ({name}, 1) "
+    "ON CONFLICT (table_name) DO UPDATE SET version = change_counters.version + 1"
+)
+CHANGE_TRIGGER_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION bump_change_counter() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    {BUMP_CHANGE_COUNTER_SQL.format(name='TG_TABLE_NAME')};
+    RETURN NULL;
+END
+$$
+"""
+
+
+def counted_tables():
+    return [t.name for t in Base.metadata.sorted_tables
+            if t.name not in APPEND_ONLY_IDS and t.name not in UNTRACKED_TABLES]
+
+
+def install_change_triggers(conn):
+    conn.exec_driver_sql(CHANGE_TRIGGER_FUNCTION)
+    for table in counted_tables():
+        conn.exec_driver_sql(
+            f'CREATE OR REPLACE TRIGGER {table}_changes AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table} '
+            f'FOR EACH STATEMENT EXECUTE FUNCTION bump_change_counter()'
+        )
+    for table in APPEND_ONLY_IDS:
+        conn.exec_driver_sql(
+            f'CREATE OR REPLACE TRIGGER {table}_removals AFTER DELETE OR TRUNCATE ON {table} '
+            f'FOR EACH STATEMENT EXECUTE FUNCTION bump_change_counter()'
+        )
+
+
+def stamp_instance(conn):
+    """Give the schema a new instance id; cached report results from before it no longer match."""
+    conn.exec_driver_sql('DELETE FROM schema_instance')
+    conn.execute(text('INSERT INTO schema_instance (instance_id) VALUES (:id)'), {'id': uuid.uuid4().hex})
+
+
+def bump_change_counter(conn, table):
+    """Mark a table changed by hand, for changes no trigger sees (e.g. detaching a partition)."""
+    conn.execute(text(BUMP_CHANGE_COUNTER_SQL.format(name=':name')), {'name': table})
+
+
+# Secondary indexes are declared on the models but built after bulk loads,
+# which is much faster than maintaining them row by row.
+POST_LOAD_INDEXES = [ix for table in Base.metadata.sorted_tables for ix in sorted(table.indexes, key=lambda ix: ix.name)]
+
+
+# --- Monthly partitioning (opt-in, --create --partitioned) ---
+# A partitioned table's primary key must include the partition key, which is
+# why order_items carries its order's date. The partitioned tables are the
+# models with order_date added to the primary key. Each order_items month
+# gets a foreign key to the matching orders month instead of one to the
+# parent table, so detaching a month never has to check the others. Nothing
+# can reference a partitioned table by order_item_id alone, so
+# modifications keeps order_item_id without a database-level foreign key.
+PARTITION_KEY = 'order_date'
+PARTITIONED_TABLES = ('orders', 'order_items')
+
+
+def partitioned_ddl():
+    """{table: CreateTable} for PARTITIONED_TABLES, derived from the models."""
+    metadata = MetaData()
+    for table in Base.metadata.sorted_tables:
+        if table.name not in PARTITIONED_TABLES:
+            table.to_metadata(metadata)  # so foreign keys to them resolve
+    ddl = {}
+    for name in PARTITIONED_TABLES:
+        table = Base.metadata.tables[name]
+        key = [c.name for c in table.primary_key.columns]
+        copy = Table(
+            name, metadata,
+            *(Column(c.name, c.type, nullable=c.nullable, autoincrement=c.name in key) for c in table.columns),
+            PrimaryKeyConstraint(*key, PARTITION_KEY),
+            *(ForeignKeyConstraint(fk.column_keys, [e.target_fullname for e in fk.elements], name=fk.name)
+              for fk in table.foreign_key_constraints if fk.referred_table.name not in PARTITIONED_TABLES),
+            postgresql_partition_by=f'RANGE ({PARTITION_KEY})',
+        )
+        ddl[name] = CreateTable(copy)
+    return ddl
+
+
+def _has_constraint(conn, name):
+    return conn.execute(text("SELECT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = :n)"), {'n': name}).scalar()
+
+
+def migrate_order_items(conn):
+    """Bring an unpartitioned database made before order_items.order_date (or its foreign key) up to the models."""
+    if not conn.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_attribute WHERE attrelid = 'order_items'::regclass "
+        "AND attname = 'order_date' AND NOT attisdropped)"
+    )).scalar():
+        conn.exec_driver_sql('ALTER TABLE order_items ADD COLUMN order_date TIMESTAMP WITHOUT TIME ZONE')
+        conn.exec_driver_sql('UPDATE order_items oi SET order_date = o.order_date FROM orders o '
+                             'WHERE o.order_id = oi.order_id')
+        conn.exec_driver_sql('ALTER TABLE order_items ALTER COLUMN order_date SET NOT NULL')
+    for table, name in (('orders', 'uq_orders_order_id_order_date'), ('order_items', 'fk_order_items_order')):
+        if not _has_constraint(conn, name):
+            conn.execute(AddConstraint(next(c for c in Base.metadata.tables[table].constraints if c.name == name)))
+    # the single-column foreign key the composite one replaces
+    conn.exec_driver_sql('ALTER TABLE order_items DROP CONSTRAINT IF EXISTS order_items_order_id_fkey')
+
+
+def create_tables(engine, partitioned=False):
+    """Like metadata.create_all, but without the secondary indexes (and with the change triggers)."""
+    with engine.begin() as conn:
+        EmployeeRole.create(conn, checkfirst=True)
+        ModificationType.create(conn, checkfirst=True)
+        existing = set(inspect(conn).get_table_names())
+        ddl = partitioned_ddl() if partitioned else {}
+        for table in Base.metadata.sorted_tables:
+            if table.name in existing:
+                continue
+            if not partitioned:
+                conn.execute(CreateTable(table))
+            elif table.name in ddl:
+                conn.execute(ddl[table.name])
+            else:
+                fks = [fk for fk in table.foreign_key_constraints if fk.referred_table.name not in PARTITIONED_TABLES]
+                conn.execute(CreateTable(table, include_foreign_key_constraints=fks))
+        if {'orders', 'order_items'} <= existing and not conn.execute(text(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('orders'))"
+        )).scalar():
+            migrate_order_items(conn)
+        install_change_triggers(conn)
+        stamp_instance(conn)
+
+
+def is_partitioned(engine):
+    with engine.connect() as conn:
+        return conn.execute(text(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('orders'))"
+        )).scalar()
+
+
+def _next_month(month):
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def month_starts(start, end):
+    """First day of every month from start's month through end's month."""
+    month = date(start.year, start.month, 1)
+    while month <= date(end.year, end.month, 1):
+        yield month
+        month = _next_month(month)
+
+
+def ensure_partitions(engine, start, end):
+    """Create the orders/order_items partitions for every month in [start, end] that is missing."""
+    created = 0
+    with engine.begin() as conn:
+        for month in month_starts(start, end):
+            suffix = f'{month:%Y_%m}'
+            if conn.execute(text("SELECT to_regclass(:t)"), {'t': f'orders_{suffix}'}).scalar():
+                continue
+            bounds = f"FOR VALUES FROM ('{month}') TO ('{_next_month(month)}')"
+            conn.exec_driver_sql(f'CREATE TABLE orders_{suffix} PARTITION OF orders {bounds}')
+            conn.exec_driver_sql(f'CREATE TABLE order_items_{suffix} PARTITION OF order_items {bounds}')
+            conn.exec_driver_sql(
+                f'ALTER TABLE order_items_{suffix} ADD CONSTRAINT fk_order_items_{suffix}_orders '
+                f'FOREIGN KEY (order_id, order_date) REFERENCES orders_{suffix} (order_id, order_date)'
+            )
+            created += 1
+    return created
+
+
+def detach_month(engine, month, drop=False):
+    """Detach one month of orders/order_items in O(1): no rows are deleted or scanned.
+
+    The detached tables stay behind as orders_YYYY_MM/order_items_YYYY_MM
+    for archiving unless drop is set. Modifications for that month's items
+    are deleted first, since they have no foreign key to cascade through,
+    and the month leaves the sales rollups too, so they keep matching the
+    base tables (their triggers bump the change counters).
+    """
+    suffix = f'{month:%Y_%m}'
+    bounds = {'lo': month, 'hi': _next_month(month)}
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            f'DELETE FROM modifications m USING order_items_{suffix} oi WHERE m.order_item_id = oi.order_item_id'
+        )
+        conn.execute(text('DELETE FROM sales_hourly WHERE sale_date >= :lo AND sale_date < :hi'), bounds)
+        conn.execute(text('DELETE FROM product_sales_daily WHERE sale_date >= :lo AND sale_date < :hi'), bounds)
+        conn.exec_driver_sql(f'ALTER TABLE order_items DETACH PARTITION order_items_{suffix}')
+        conn.exec_driver_sql(f'ALTER TABLE orders DETACH PARTITION orders_{suffix}')
+        # ids don't go down when old rows leave, so tell cached reports explicitly
+        bump_change_counter(conn, 'orders')
+        bump_change_counter(conn, 'order_items')
+        if drop:
+            conn.exec_driver_sql(f'DROP TABLE order_items_{suffix}, orders_{suffix}')
+
+
+def create_indexes(engine):
+    """Build the secondary indexes and refresh planner statistics."""
+    with engine.begin() as conn:
+        for ix in POST_LOAD_INDEXES:
+            ix.create(conn, checkfirst=True)
+    # VACUUM can't run in a transaction; it also sets the visibility map index-only scans need
+    with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+        for table in Base.metadata.sorted_tables:
+            conn.exec_driver_sql(f'VACUUM (ANALYZE) {table.name}')
+
+
+def drop_indexes(engine):
+    """Drop the secondary indexes ahead of a bulk load."""
+    with engine.begin() as conn:
+        for ix in POST_LOAD_INDEXES:
+            ix.drop(conn, checkfirst=True)
+
+
+@functools.lru_cache(maxsize=None)
+def get_engine(url: str, pool_size: int = None, pre_ping: bool = True, statement_timeout_ms: int = None):
+    """The shared engine for url; one per distinct set of options per process.
+
+    pool_size and statement_timeout_ms default to the DB_POOL_SIZE and
+    DB_STATEMENT_TIMEOUT_MS environment variables (5 and no timeout).
+    """
+    if pool_size is None:
+        pool_size = int(os.environ.get('DB_POOL_SIZE', 5))
+    if statement_timeout_ms is None:
+        statement_timeout_ms = int(os.environ.get('DB_STATEMENT_TIMEOUT_MS', 0))
+    connect_args = {'options': f'-c statement_timeout={statement_timeout_ms}'} if statement_timeout_ms else {}
+    return create_engine(url, echo=False, pool_size=pool_size, pool_pre_ping=pre_ping, connect_args=connect_args)
+
+
+def create_db(url: str, partitioned: bool = False):
     """Create database schema at the provided SQLAlchemy URL."""
-    # echo=True prints the generated SQL statements; set to False to silence
+    # a private engine with echo, which prints the generated SQL statements while the
+    # tables are created; the shared one from get_engine stays quiet for its other users
     engine = create_engine(url, echo=True)
+    try:
+        print("Creating all tables on:", engine.url)
+        create_tables(engine, partitioned)
+        if partitioned:
+            from seeder import START_DATE, END_DATE
+            ensure_partitions(engine, START_DATE, END_DATE)
+    finally:
+        engine.dispose()
 
-    print("Creating all tables on:", engine.url)
-    Base.metadata.create_all(engine)
-    
     print("Tables created")
 
 def fill_baseInfo(url: str):
     """Insert initial data into the database."""
-    engine = create_engine(url, echo=False)
+    engine = get_engine(url)
     Session = sessionmaker(bind=engine)
     session = Session()
 
     try:
         # --- Employees ---
-        employees = [
-            Employee(employee_id=1, name="Andre Athari", role="Cashier"),
-            Employee(employee_id=2, name="Raafay Hemani", role="Cashier"),
-            Employee(employee_id=3, name="Liam Alme", role="Manager"),
-            Employee(employee_id=4, name="Matthew Jones", role="Cashier"),
-            Employee(employee_id=5, name="Sam Maharjan", role="Cashier"),
-        ]
-        session.add_all(employees)
-
-        # --- Products ---
-        products = [
-            Product(product_id=1,  product_name="mango milk tea",          unit_price=5.80),
-            Product(product_id=2,  product_name="watermelon milk tea",     unit_price=6.00),
-            Product(product_id=3,  product_name="coconut milk tea",        unit_price=6.50),
-            Product(product_id=4,  product_name="peach milk tea",          unit_price=6.25),
-            Product(product_id=5,  product_name="passion-fruit milk tea",  unit_price=6.25),
-            Product(product_id=6,  product_name="lychee milk tea",         unit_price=6.25),
-            Product(product_id=7,  product_name="pineapple milk tea",      unit_price=6.50),
-            Product(product_id=8,  product_name="honey milk tea",          unit_price=6.75),
-            Product(product_id=9,  product_name="dragon-fruit milk tea",   unit_price=4.65),
-            Product(product_id=10, product_name="pomegranate milk tea",    unit_price=4.85),
-            Product(product_id=11, product_name="mango green tea",         unit_price=5.80),
-            Product(product_id=12, product_name="watermelon green tea",    unit_price=6.25),
-            Product(product_id=13, product_name="coconut green tea",       unit_price=6.25),
-            Product(product_id=14, product_name="peach green tea",         unit_price=6.25),
-            Product(product_id=15, product_name="passion-fruit green tea", unit_price=5.20),
-            Product(product_id=16, product_name="lychee green tea",        unit_price=6.50),
-            Product(product_id=17, product_name="pineapple green tea",     unit_price=5.80),
-            Product(product_id=18, product_name="honey green tea",         unit_price=6.25),
-            Product(product_id=19, product_name="dragon-fruit green tea",  unit_price=6.50),
-            Product(product_id=20, product_name="pomegranate green tea",   unit_price=6.25),
-        ]
-        session.add_all(products)
-
-        # --- Inventory ---
-        inventory = [
-            Inventory(ingredient_id=1,  ingredient_name="mango",         on_hand_quantity=0),
-            Inventory(ingredient_id=2,  ingredient_name="watermelon",    on_hand_quantity=12),
-            Inventory(ingredient_id=3,  ingredient_name="coconut",       on_hand_quantity=8),
-            Inventory(ingredient_id=4,  ingredient_name="peach",         on_hand_quantity=4),
-            Inventory(ingredient_id=5,  ingredient_name="passion-fruit", on_hand_quantity=5),
-            Inventory(ingredient_id=6,  ingredient_name="lychee",        on_hand_quantity=9),
-            Inventory(ingredient_id=7,  ingredient_name="pineapple",     on_hand_quantity=2),
-            Inventory(ingredient_id=8,  ingredient_name="honey",         on_hand_quantity=4),
-            Inventory(ingredient_id=9,  ingredient_name="dragon-fruit",  on_hand_quantity=11),
-            Inventory(ingredient_id=10, ingredient_name="pomegranate",   on_hand_quantity=3),
-            Inventory(ingredient_id=11, ingredient_name="milk tea",      on_hand_quantity=15),
-            Inventory(ingredient_id=12, ingredient_name="green tea",     on_hand_quantity=20),
-            Inventory(ingredient_id=13, ingredient_name="cup",           on_hand_quantity=40),
-            Inventory(ingredient_id=14, ingredient_name="napkin",        on_hand_quantity=29),
-            Inventory(ingredient_id=15, ingredient_name="straw",         on_hand_quantity=53),
-            Inventory(ingredient_id=16, ingredient_name="lid",           on_hand_quantity=40),
-        ]
-        session.add_all(inventory)
-
-        product_recipe = [
-            # Milk teas
-            ProductRecipe(product_id=1,  ingredient_id=1,  quantity_per_unit=1),   # mango
-            ProductRecipe(product_id=1,  ingredient_id=11, quantity_per_unit=1),   # milk tea
-            ProductRecipe(product_id=1,  ingredient_id=13, quantity_per_unit=1),   # cup
-            ProductRecipe(product_id=1,  ingredient_id=14, quantity_per_unit=1),   # napkin
-            ProductRecipe(product_id=1,  ingredient_id=15, quantity_per_unit=1),   # straw
-            ProductRecipe(product_id=1,  ingredient_id=16, quantity_per_unit=1),   # lid
-
-            ProductRecipe(product_id=2,  ingredient_id=2,  quantity_per_unit=1),
-            ProductRecipe(product_id=2,  ingredient_id=11, quantity_per_unit=1),
-            ProductRecipe(product_id=2,  ingredient_id=13, quantity_per_unit=1),
-            ProductRecipe(product_id=2,  ingredient_id=15, quantity_per_unit=1),
-            ProductRecipe(product_id=2,  ingredient_id=16, quantity_per_unit=1),
-
-            ProductRecipe(product_id=3,  ingredient_id=3,  quantity_per_unit=1),
-            ProductRecipe(product_id=3,  ingredient_id=11, quantity_per_unit=1),
-            ProductRecipe(product_id=3,  ingredient_id=13, quantity_per_unit=1),
-            ProductRecipe(product_id=3,  ingredient_id=14, quantity_per_unit=1),
-            ProductRecipe(product_id=3,  ingredient_id=15, quantity_per_unit=1),
-            ProductRecipe(product_id=3,  ingredient_id=16, quantity_per_unit=1),
-
-            ProductRecipe(product_id=4,  ingredient_id=4,  quantity_per_unit=1),
-            ProductRecipe(product_id=4,  ingredient_id=11, quantity_per_unit=1),
-            ProductRecipe(product_id=4,  ingredient_id=13, quantity_per_unit=1),
-            ProductRecipe(product_id=4,  ingredient_id=15, quantity_per_unit=1),
-            ProductRecipe(product_id=4,  ingredient_id=16, quantity_per_unit=1),
-
-            ProductRecipe(product_id=5,  ingredient_id=5,  quantity_per_unit=1),
-            ProductRecipe(product_id=5,  ingredient_id=11, quantity_per_unit=1),
-            ProductRecipe(product_id=5,  ingredient_id=13, quantity_per_unit=1),
-            ProductRecipe(product_id=5,  ingredient_id=14, quantity_per_unit=1),
-            ProductRecipe(product_id=5,  ingredient_id=15, quantity_per_unit=1),
-            ProductRecipe(product_id=5,  ingredient_id=16, quantity_per_unit=1),
-
-            ProductRecipe(product_id=6,  ingredient_id=6,  quantity_per_unit=1),
-            ProductRecipe(product_id=6,  ingredient_id=11, quantity_per_unit=1),
-            ProductRecipe(product_id=6,  ingredient_id=13, quantity_per_unit=1),
-            ProductRecipe(product_id=6,  ingredient_id=15, quantity_per_unit=1),
-            ProductRecipe(product_id=6,  ingredient_id=16, quantity_per_unit=1),
-
-            ProductRecipe(product_id=7,  ingredient_id=7,  quantity_per_unit=1),
-            ProductRecipe(product_id=7,  ingredient_id=11, quantity_per_unit=1),
-            ProductRecipe(product_id=7,  ingredient_id=13, quantity_per_unit=1),
-            ProductRecipe(product_id=7,  ingredient_id=14, quantity_per_unit=1),
-            ProductRecipe(product_id=7,  ingredient_id=15, quantity_per_unit=1),
-            ProductRecipe(product_id=7,  ingredient_id=16, quantity_per_unit=1),
-
-            ProductRecipe(product_id=8,  ingredient_id=8,  quantity_per_unit=1),
-            ProductRecipe(product_id=8,  ingredient_id=11, quantity_per_unit=1),
-            ProductRecipe(product_id=8,  ingredient_id=13, quantity_per_unit=1),
-            ProductRecipe(product_id=8,  ingredient_id=15, quantity_per_unit=1),
-            ProductRecipe(product_id=8,  ingredient_id=16, quantity_per_unit=1),
-
-            ProductRecipe(product_id=9,  ingredient_id=9,  quantity_per_unit=1),
-            ProductRecipe(product_id=9,  ingredient_id=11, quantity_per_unit=1),
-            ProductRecipe(product_id=9,  ingredient_id=13, quantity_per_unit=1),
-            ProductRecipe(product_id=9,  ingredient_id=14, quantity_per_unit=1),
-            ProductRecipe(product_id=9,  ingredient_id=15, quantity_per_unit=1),
-            ProductRecipe(product_id=9,  ingredient_id=16, quantity_per_unit=1),
-
-            ProductRecipe(product_id=10, ingredient_id=10, quantity_per_unit=1),
-            ProductRecipe(product_id=10, ingredient_id=11, quantity_per_unit=1),
-            ProductRecipe(product_id=10, ingredient_id=13, quantity_per_unit=1),
-            ProductRecipe(product_id=10, ingredient_id=15, quantity_per_unit=1),
-
-            # Green teas
-            ProductRecipe(product_id=11, ingredient_id=1,  quantity_per_unit=1),
-            ProductRecipe(product_id=11, ingredient_id=12, quantity_per_unit=1),
-            ProductRecipe(product_id=11, ingredient_id=13, quantity_per_unit=1),
-            ProductRecipe(product_id=11, ingredient_id=14, quantity_per_unit=1),
-
-            ProductRecipe(product_id=12, ingredient_id=2,  quantity_per_unit=1),
-            ProductRecipe(product_id=12, ingredient_id=12, quantity_per_unit=1),
-            ProductRecipe(product_id=12, ingredient_id=13, quantity_per_unit=1),
-
-            ProductRecipe(product_id=13, ingredient_id=3,  quantity_per_unit=1),
-            ProductRecipe(product_id=13, ingredient_id=12, quantity_per_unit=1),
-            ProductRecipe(product_id=13, ingredient_id=13, quantity_per_unit=1),
-            ProductRecipe(product_id=13, ingredient_id=14, quantity_per_unit=1),
-
-            ProductRecipe(product_id=14, ingredient_id=4,  quantity_per_unit=1),
-            ProductRecipe(product_id=14, ingredient_id=12, quantity_per_unit=1),
-            ProductRecipe(product_id=14, ingredient_id=13, quantity_per_unit=1),
-
-            ProductRecipe(product_id=15, ingredient_id=5,  quantity_per_unit=1),
-            ProductRecipe(product_id=15, ingredient_id=12, quantity_per_unit=1),
-            ProductRecipe(product_id=15, ingredient_id=13, quantity_per_unit=1),
-            ProductRecipe(product_id=15, ingredient_id=14, quantity_per_unit=1),
-
-            ProductRecipe(product_id=16, ingredient_id=6,  quantity_per_unit=1),
-            ProductRecipe(product_id=16, ingredient_id=12, quantity_per_unit=1),
-            ProductRecipe(product_id=16, ingredient_id=13, quantity_per_unit=1),
-
-            ProductRecipe(product_id=17, ingredient_id=7,  quantity_per_unit=1),
-            ProductRecipe(product_id=17, ingredient_id=12, quantity_per_unit=1),
-            ProductRecipe(product_id=17, ingredient_id=13, quantity_per_unit=1),
-            ProductRecipe(product_id=17, ingredient_id=14, quantity_per_unit=1),
-
-            ProductRecipe(product_id=18, ingredient_id=8,  quantity_per_unit=1),
-            ProductRecipe(product_id=18, ingredient_id=12, quantity_per_unit=1),
-            ProductRecipe(product_id=18, ingredient_id=13, quantity_per_unit=1),
-
-            ProductRecipe(product_id=19, ingredient_id=9,  quantity_per_unit=1),
-            ProductRecipe(product_id=19, ingredient_id=12, quantity_per_unit=1),
-            ProductRecipe(product_id=19, ingredient_id=13, quantity_per_unit=1),
-            ProductRecipe(product_id=19, ingredient_id=14, quantity_per_unit=1),
-
-            ProductRecipe(product_id=20, ingredient_id=10, quantity_per_unit=1),
-            ProductRecipe(product_id=20, ingredient_id=12, quantity_per_unit=1),
-            ProductRecipe(product_id=20, ingredient_id=13, quantity_per_unit=1),
-        ]
-        session.add_all(product_recipe)
+        session.add_all(Employee(employee_id=i, name=name, role=role) for i, name, role in EMPLOYEES)
+
+        # --- Products, inventory and recipes (data.csv, inventory.csv, recipes.csv) ---
+        load_catalog(session.connection(), read_catalog())
 
         session.commit()
         print("Base information inserted successfully.")
@@ -310,8 +675,18 @@ def fill_baseInfo(url: str):
 def parse_args():
     p = argparse.ArgumentParser(description='Create Postgres schema for project')
     p.add_argument('--url', help='SQLAlchemy database URL (overrides DATABASE_URL env)')
-    p.add_argument('--create', action='store_true', help='Create tables')
+    p.add_argument('--create', action='store_true', help='Create tables and base info (no secondary indexes; see --indexes)')
     p.add_argument('--drop', action='store_true', help='Drop tables before create (USE WITH CAUTION)')
+    p.add_argument('--partitioned', action='store_true', help='With --create: partition orders/order_items by month')
+    p.add_argument('--detach-month', metavar='YYYY-MM', help='Detach one month of orders/order_items from a partitioned database')
+    p.add_argument('--drop-detached', action='store_true', help='With --detach-month: drop the detached tables too')
+    p.add_argument('--catalog', action='store_true', help='Upsert products, inventory and recipes from the catalog CSVs')
+    p.add_argument('--indexes', action='store_true', help='Build the secondary indexes, e.g. after a manual seed.sql load')
+    p.add_argument('--refresh-rollups', action='store_true', help='Fold new orders into the sales rollup tables')
+    p.add_argument('--rebuild-rollups', action='store_true', help='Recompute the sales rollup tables from scratch')
+    p.add_argument('--deplete-inventory', action='store_true', help='Take ingredients of new orders out of inventory')
+    p.add_argument('--rebuild-depletion', action='store_true',
+                   help='Restock everything in the ingredient ledger and replay all orders')
     return p.parse_args()
 
 
@@ -325,7 +700,7 @@ def main():
         print('ERROR: no database URL provided. Set DATABASE_URL or pass --url')
         return
 
-    engine = create_engine(db_url, echo=False)
+    engine = get_engine(db_url)
     if args.drop:
         confirm = input('Drop all tables? This is destructive. Type DROP to continue: ')
         if confirm == 'DROP':
@@ -335,9 +710,32 @@ def main():
             print('Aborted drop.')
 
     if args.create:
-        create_db(db_url)
+        create_db(db_url, args.partitioned)
         fill_baseInfo(db_url)
 
+    if args.catalog:
+        with engine.begin() as conn:
+            load_catalog(conn, read_catalog())
+        print('Catalog loaded.')
+
+    # --create leaves the indexes to whatever loads the data (loader.py, or --indexes after seed.sql)
+    if args.indexes:
+        create_indexes(engine)
+        print('Indexes built.')
+
+    if args.detach_month:
+        year, month = map(int, args.detach_month.split('-'))
+        detach_month(engine, date(year, month, 1), drop=args.drop_detached)
+        print(f'Detached {args.detach_month}' + (' and dropped it.' if args.drop_detached else '.'))
+
+    if args.refresh_rollups or args.rebuild_rollups:
+        n = refresh_rollups(engine, rebuild=args.rebuild_rollups)
+        print(f'Rolled up {n} new orders.')
+
+    if args.deplete_inventory or args.rebuild_depletion:
+        n = deplete_inventory(engine, rebuild=args.rebuild_depletion)
+        print(f'Depleted inventory for {n} new orders.')
+
 
 if __name__ == '__main__':
     main()
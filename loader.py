@@ -0,0 +1,332 @@
+import os
+import io
+import time
+import queue
+import argparse
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+
+import seeder
+import db_schema
+import profiling
+import artifacts
+
+
+class QueueReader:
+    """File-like object for copy_expert that is filled from another thread.
+
+    The queue is bounded, so the generator can never run more than a few
+    chunks ahead of what Postgres has consumed.
+    """
+
+    def __init__(self, maxsize=4):
+        self.q = queue.Queue(maxsize)
+
+    def read(self, size=-1):
+        chunk = self.q.get()
+        return "" if chunk is None else chunk
+
+    def feed(self, text, consumer):
+        """Queue text for the COPY, surfacing the consumer's error instead of blocking forever."""
+        if not text:
+            return  # an empty read is end of data to copy_expert; a chunk with no rows sends nothing
+        while True:
+            try:
+                self.q.put(text, timeout=1)
+                return
+            except queue.Full:
+                if consumer.done():
+                    consumer.result()
+                    raise RuntimeError("COPY finished before all rows were sent")
+
+    def close(self, consumer):
+        while not consumer.done():
+            try:
+                self.q.put(None, timeout=1)
+                return
+            except queue.Full:
+                pass
+
+
+def copy_in(engine, table, source):
+    """COPY a file-like object or string of CSV rows into a staging table on its own connection."""
+    if isinstance(source, str):
+        source = io.StringIO(source)
+    conn = engine.raw_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.copy_expert(f"COPY {table} ({seeder.STAGE_COLUMNS[table]}) FROM STDIN WITH (FORMAT csv)", source)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def prepare_stage(engine):
+    with engine.begin() as conn:
+        for table in seeder.STAGE_TABLES:
+            conn.exec_driver_sql(seeder.create_stage_sql(table))
+            conn.exec_driver_sql(f"TRUNCATE {table}")
+
+
+def stage_rows(engine, cat, employees, chunks):
+    """Stream the catalog, employees and generated orders into the staging tables concurrently."""
+    readers = {table: QueueReader() for table in ("orders_stage", "order_items_stage", "modifications_stage")}
+    n_orders = n_items = n_mods = 0
+    with ThreadPoolExecutor(max_workers=4 + len(readers)) as ex:
+        copies = [ex.submit(copy_in, engine, table, seeder.csv_text(rows))
+                  for table, rows in seeder.catalog_stage_rows(cat, employees).items()]
+        consumers = {table: ex.submit(copy_in, engine, table, reader) for table, reader in readers.items()}
+        try:
+            for chunk in chunks:
+                for table, text in zip(readers, (chunk.orders, chunk.items, chunk.mods)):
+                    readers[table].feed(text, consumers[table])
+                n_orders += chunk.n_orders
+                n_items += chunk.n_items
+                n_mods += chunk.n_mods
+        finally:
+            for table, reader in readers.items():
+                reader.close(consumers[table])
+        for f in copies + list(consumers.values()):
+            f.result()
+    return n_orders, n_items, n_mods
+
+
+def _execute(engine, sql):
+    with engine.begin() as conn:
+        conn.exec_driver_sql("SET LOCAL synchronous_commit = off")
+        conn.exec_driver_sql(sql)
+
+
+def finalize(engine, jobs=1):
+    """Move staged rows into the real tables, then drop the staging tables.
+
+    By default everything commits as one transaction. jobs > 1 runs the
+    tables of each load level on parallel connections, each committing on
+    its own, so a failure partway (say an FK violation in order_items)
+    leaves the earlier tables loaded; it is opt-in for that reason.
+    """
+    if jobs <= 1:
+        with engine.begin() as conn:
+            conn.exec_driver_sql("SET LOCAL synchronous_commit = off")
+            for level in seeder.LOAD_LEVELS:
+                for target in level:
+                    conn.exec_driver_sql(seeder.INSERT_SQL[target])
+    else:
+        # tables in the same level have no foreign keys between them
+        with ThreadPoolExecutor(max_workers=jobs) as ex:
+            for level in seeder.LOAD_LEVELS:
+                for f in [ex.submit(_execute, engine, seeder.INSERT_SQL[t]) for t in level]:
+                    f.result()
+    with engine.begin() as conn:
+        for table in seeder.STAGE_TABLES:
+            conn.exec_driver_sql(f"DROP TABLE {table}")
+        for sql in seeder.SETVAL_SQL.values():
+            conn.exec_driver_sql(sql)
+
+
+def load(url, start=seeder.START_DATE, end=seeder.END_DATE, sales_target=None,
+         chunk_days=seeder.CHUNK_DAYS, chunk_orders=seeder.CHUNK_ORDERS, jobs=1, workers=1, cprofile=None,
+         scale_factor=1.0, seed=seeder.SEED):
+    """Generate the seed data and load it into the database at url without touching disk.
+
+    sales_target defaults to the standard history times scale_factor; the
+    same seed and settings load the same rows seeder.py would write.
+    """
+    engine = db_schema.get_engine(url, pool_size=max(4, jobs))
+    profiling.attach(engine)
+    t0 = time.perf_counter()
+    with profiling.span("read catalog"):
+        cat, employees, menu = seeder.read_dataset(scale_factor)
+    with profiling.span("plan"):
+        counts = seeder.plan_daily_orders(menu, start, end, sales_target)
+    # generation runs on this thread while the COPYs drain the queues on others
+    with profiling.span("stage") as s, profiling.cprofile(cprofile):
+        chunks = seeder.iter_stage_chunks(menu, start, counts, workers, chunk_days, chunk_orders, seed=seed)
+        prepare_stage(engine)
+        n_orders, n_items, n_mods = stage_rows(engine, cat, employees, chunks)
+        s.rows = n_orders + n_items + n_mods
+    print(f"Staged {n_orders} orders / {n_items} order items / {n_mods} modifications in {time.perf_counter() - t0:.2f}s")
+    publish(engine, start, end, n_orders, n_items, n_mods, jobs)
+    return n_orders, n_items, n_mods
+
+
+def publish(engine, start, end, n_orders, n_items, n_mods, jobs=1):
+    """Everything after staging: partitions, the final inserts, indexes, rollups and depletion."""
+    t1 = time.perf_counter()
+    with profiling.span("prepare tables"):
+        if db_schema.is_partitioned(engine):
+            db_schema.ensure_partitions(engine, start, end)
+        db_schema.drop_indexes(engine)
+    try:
+        with profiling.span("insert from stage", n_orders + n_items + n_mods):
+            finalize(engine, jobs)
+        t2 = time.perf_counter()
+        print(f"Loaded into final tables in {t2 - t1:.2f}s")
+    finally:
+        # also when finalize fails, so the live tables never stay without their indexes
+        with profiling.span("create indexes"):
+            db_schema.create_indexes(engine)
+    t3 = time.perf_counter()
+    print(f"Built indexes in {t3 - t2:.2f}s")
+    with profiling.span("refresh rollups", n_orders):
+        db_schema.refresh_rollups(engine)
+    t4 = time.perf_counter()
+    print(f"Refreshed rollups in {t4 - t3:.2f}s")
+    with profiling.span("deplete inventory", n_items):
+        db_schema.deplete_inventory(engine)
+    print(f"Depleted inventory in {time.perf_counter() - t4:.2f}s")
+
+
+def copy_artifact_in(engine, table, artifact_dir, entry):
+    conn = engine.raw_connection()
+    try:
+        with conn.cursor() as cur:
+            rows = artifacts.copy_artifact(cur, table, artifact_dir, entry)
+        conn.commit()
+        return rows
+    finally:
+        conn.close()
+
+
+def load_artifacts(url, artifact_dir, jobs=1):
+    """Load binary COPY artifacts written by seeder.py --format binary, checking the manifest as they stream."""
+    engine = db_schema.get_engine(url, pool_size=max(4, jobs))
+    profiling.attach(engine)
+    t0 = time.perf_counter()
+    manifest = artifacts.read_manifest(artifact_dir)
+    tables = manifest["tables"]
+    with profiling.span("stage", sum(entry["rows"] for entry in tables.values())):
+        prepare_stage(engine)
+        with ThreadPoolExecutor(max_workers=len(tables)) as ex:
+            for f in [ex.submit(copy_artifact_in, engine, table, artifact_dir, entry) for table, entry in tables.items()]:
+                f.result()
+    n_orders, n_items, n_mods = (tables[f"{t}_stage"]["rows"] for t in seeder.ORDER_TABLES)
+    print(f"Staged {n_orders} orders / {n_items} order items / {n_mods} modifications from {artifact_dir} "
+          f"in {time.perf_counter() - t0:.2f}s")
+    start, end = (datetime.fromisoformat(manifest[k]) for k in ("start", "end"))
+    publish(engine, start, end, n_orders, n_items, n_mods, jobs)
+    return n_orders, n_items, n_mods
+
+
+def copy_text(conn, table, text):
+    """COPY CSV text into a table over an open SQLAlchemy connection (inside its transaction)."""
+    with conn.connection.dbapi_connection.cursor() as cur:
+        cur.copy_expert(f"COPY {table} ({seeder.STAGE_COLUMNS[table]}) FROM STDIN WITH (FORMAT csv)", io.StringIO(text))
+
+
+def append(url, days=1, sales_target=None, chunk_days=seeder.CHUNK_DAYS, chunk_orders=seeder.CHUNK_ORDERS, workers=1,
+           cprofile=None, scale_factor=1.0, seed=seeder.SEED):
+    """Add the next `days` days of sales after the last order in the database, in one transaction.
+
+    Ids continue from the current maxima and each day draws from its own
+    seeded stream, so reruns are reproducible. Indexes stay in place and the
+    rollups refresh incrementally, so the cost follows the new rows only.
+    scale_factor must match the one the database was loaded with; seed
+    picks the stream the new days draw from.
+    """
+    engine = db_schema.get_engine(url)
+    profiling.attach(engine)
+    t0 = time.perf_counter()
+    with engine.connect() as conn:
+        last = conn.exec_driver_sql("SELECT MAX(order_date) FROM orders").scalar()
+    start = seeder.START_DATE if last is None else datetime.combine(last.date() + timedelta(days=1), datetime.min.time())
+    end = start + timedelta(days=days - 1)
+    if sales_target is None:
+        sales_target = seeder.daily_sales_target(scale_factor) * days
+    if db_schema.is_partitioned(engine):
+        db_schema.ensure_partitions(engine, start, end)
+
+    with profiling.span("read catalog"):
+        _, _, menu = seeder.read_dataset(scale_factor)
+    with profiling.span("plan"):
+        counts = seeder.plan_daily_orders(menu, start, end, sales_target)
+    n_orders = n_items = n_mods = 0
+    with profiling.span("append") as s, engine.begin() as conn:
+        # writers wait until we commit; readers carry on
+        conn.exec_driver_sql("LOCK TABLE orders, order_items, modifications IN EXCLUSIVE MODE")
+        if conn.exec_driver_sql("SELECT MAX(order_date) FROM orders").scalar() != last:
+            raise RuntimeError("orders were added while preparing the append; rerun it")
+        first_order_id = conn.exec_driver_sql("SELECT COALESCE(MAX(order_id), 0) + 1 FROM orders").scalar()
+        first_item_id = conn.exec_driver_sql("SELECT COALESCE(MAX(order_item_id), 0) + 1 FROM order_items").scalar()
+        first_mod_id = conn.exec_driver_sql("SELECT COALESCE(MAX(modification_id), 0) + 1 FROM modifications").scalar()
+        for table in seeder.ORDER_TABLES:
+            conn.exec_driver_sql(f"CREATE TEMP TABLE {table}_stage ({seeder.STAGE_TABLES[table + '_stage']}) ON COMMIT DROP")
+        with profiling.cprofile(cprofile):
+            for chunk in seeder.iter_stage_chunks(menu, start, counts, workers, chunk_days, chunk_orders,
+                                                  first_order_id, first_item_id, first_mod_id, seed=seed):
+                with profiling.span("copy", chunk.n_orders + chunk.n_items + chunk.n_mods):
+                    copy_text(conn, "orders_stage", chunk.orders)
+                    copy_text(conn, "order_items_stage", chunk.items)
+                    copy_text(conn, "modifications_stage", chunk.mods)
+                n_orders += chunk.n_orders
+                n_items += chunk.n_items
+                n_mods += chunk.n_mods
+        with profiling.span("insert from stage", n_orders + n_items + n_mods):
+            for table in seeder.ORDER_TABLES:
+                conn.exec_driver_sql(seeder.INSERT_SQL[table])
+            for table in seeder.ORDER_TABLES:
+                conn.exec_driver_sql(seeder.SETVAL_SQL[table])
+        s.rows = n_orders + n_items + n_mods
+    print(f"Appended {n_orders} orders / {n_items} order items / {n_mods} modifications for "
+          f"{start:%Y-%m-%d}..{end:%Y-%m-%d} in {time.perf_counter() - t0:.2f}s")
+    with profiling.span("refresh rollups", n_orders):
+        db_schema.refresh_rollups(engine)
+    with profiling.span("deplete inventory", n_items):
+        db_schema.deplete_inventory(engine)
+    return n_orders, n_items, n_mods
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description='Generate seed data and COPY it straight into Postgres')
+    p.add_argument('--url', help='SQLAlchemy database URL (overrides DATABASE_URL env)')
+    p.add_argument('--jobs', type=int, default=1,
+                   help='final inserts in one transaction (1, the default) or on N parallel connections that each '
+                        'commit separately, so a failure can leave some tables loaded')
+    p.add_argument('--append', type=int, metavar='DAYS',
+                   help='add DAYS days after the last order instead of loading --start..--end '
+                        '(--sales-target then defaults to the usual daily rate; pass the --scale-factor of the load)')
+    p.add_argument('--from-artifacts', metavar='DIR',
+                   help='load the binary COPY artifacts written by seeder.py --format binary instead of generating')
+    seeder.add_generation_args(p)
+    # None marks "not given", so --append can refuse a range it would ignore
+    p.set_defaults(start=None, end=None)
+    args = p.parse_args()
+    if args.jobs < 1:
+        p.error(f'--jobs must be at least 1, got {args.jobs}')
+    if args.append is not None:
+        if args.append < 1:
+            p.error(f'--append needs at least 1 day, got {args.append}')
+        if args.start is not None or args.end is not None:
+            p.error('--append continues after the last order; it takes no --start/--end')
+    args.start = args.start or seeder.START_DATE
+    args.end = args.end or seeder.END_DATE
+    return seeder.check_generation_args(p, args)
+
+
+def main():
+    args = parse_args()
+    load_dotenv()
+    db_url = args.url or os.environ.get('DATABASE_URL')
+
+    if not db_url:
+        print('ERROR: no database URL provided. Set DATABASE_URL or pass --url')
+        return
+
+    if args.profile:
+        profiler = profiling.start()
+    if args.from_artifacts:
+        load_artifacts(db_url, args.from_artifacts, args.jobs)
+    elif args.append is not None:
+        append(db_url, args.append, args.sales_target, args.chunk_days, args.chunk_orders, args.workers, args.cprofile,
+               args.scale_factor, args.seed)
+    else:
+        load(db_url, args.start, args.end, args.sales_target, args.chunk_days, args.chunk_orders,
+             args.jobs, args.workers, args.cprofile, args.scale_factor, args.seed)
+    if args.profile:
+        profiling.print_report(profiler.write(args.profile, command='loader.py', args=vars(args)))
+        profiling.stop()
+
+
+if __name__ == '__main__':
+    main()
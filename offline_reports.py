@@ -0,0 +1,221 @@
+"""The queries/ and queries/special/ reports, computed in-process from a snapshot.py export.
+
+Every report is a handful of bincount/argsort passes over memory-mapped
+columns and returns a DataFrame with the SQL version's column names.
+Money comes back as float dollars, and groups whose SQL order is
+unspecified come back in key order.
+"""
+import os
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+from snapshot import Snapshot
+
+SECONDS_PER_DAY = 86400
+WEEKDAYS = np.array(['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun'], dtype=object)
+
+
+def _days(ts):
+    return ts // SECONDS_PER_DAY
+
+
+def _iso_dow(days):
+    # 1970-01-01 was a Thursday
+    return (days + 3) % 7 + 1
+
+
+def _iso_week(days):
+    """ISO 8601 week number: the week belongs to the year its Thursday falls in."""
+    thursday = days - _iso_dow(days) + 4
+    year_start = thursday.astype('datetime64[D]').astype('datetime64[Y]').astype('datetime64[D]').astype(np.int64)
+    return (thursday - year_start) // 7 + 1
+
+
+def _group(keys, weights=None, minlength=0):
+    """(key values present, row counts, weight sums) for small non-negative int keys."""
+    counts = np.bincount(keys, minlength=minlength)
+    present = np.flatnonzero(counts)
+    sums = None if weights is None else np.bincount(keys, weights=weights, minlength=minlength)[present]
+    return present, counts[present], sums
+
+
+def _top(frame, column, n=None):
+    frame = frame.sort_values(column, ascending=False, kind='stable')
+    return (frame if n is None else frame.head(n)).reset_index(drop=True)
+
+
+def _lookup(ids, values):
+    """values as an array indexable by id."""
+    table = np.empty(int(ids.max()) + 1 if len(ids) else 0, dtype=values.dtype)
+    table[ids] = values
+    return table
+
+
+def avg_order_value_per_day(s):
+    days = _days(s.col('orders', 'order_ts'))
+    first = days.min() if len(days) else 0
+    day, count, cents = _group(days - first, s.col('orders', 'total_cents'))
+    return pd.DataFrame({'order_day': (day + first).astype('datetime64[D]').astype(object),
+                         'avg_order_value': cents / count / 100})
+
+
+def _cashier_totals(s):
+    employee, count, cents = _group(s.col('orders', 'employee_id'), s.col('orders', 'total_cents'))
+    roles = _lookup(s.col('employees', 'employee_id'), s.strings('employees', 'role'))
+    role = roles[employee]
+    keep = role == 'Cashier'
+    frame = pd.DataFrame({'employee_id': employee[keep], 'role': role[keep],
+                          'orders_handled': count[keep], 'revenue_processed': cents[keep] / 100})
+    return _top(frame, 'revenue_processed')
+
+
+def cashier_performance(s):
+    return _cashier_totals(s)
+
+
+def firable_employees(s):
+    frame = _cashier_totals(s)
+    return frame[frame['revenue_processed'] < 240000].reset_index(drop=True)
+
+
+def no_supply(s):
+    on_hand = s.col('inventory', 'on_hand_tenths')
+    keep = on_hand == 0
+    return pd.DataFrame({'ingredient_id': s.col('inventory', 'ingredient_id')[keep],
+                         'ingredient_name': s.strings('inventory', 'ingredient_name')[keep],
+                         'on_hand_quantity': on_hand[keep] / 10})
+
+
+def orders_and_revenue_by_day(s):
+    dow, count, cents = _group(_iso_dow(_days(s.col('orders', 'order_ts'))), s.col('orders', 'total_cents'))
+    return pd.DataFrame({'iso_dow': dow, 'weekday': WEEKDAYS[dow - 1], 'orders_count': count, 'revenue': cents / 100})
+
+
+def sales_by_month(s):
+    months = s.col('orders', 'order_ts').astype('datetime64[s]').astype('datetime64[M]').astype(np.int64) % 12
+    _, count, _ = _group(months)
+    return pd.DataFrame({'orders': count})
+
+
+def _units_by_product(s):
+    return np.bincount(s.col('order_items', 'product_id'), weights=s.col('order_items', 'quantity'))
+
+
+def top10_ingredients(s):
+    units = _units_by_product(s)
+    recipe_product = s.col('product_recipe', 'product_id')
+    used = np.zeros(len(recipe_product))
+    sold = recipe_product < len(units)
+    used[sold] = units[recipe_product[sold]] * s.col('product_recipe', 'quantity_tenths')[sold]
+    ingredient, _, tenths = _group(s.col('product_recipe', 'ingredient_id')[sold], used[sold])
+    # the SQL joins order_items, so ingredients only in products that never sold have no row
+    keep = tenths > 0
+    names = _lookup(s.col('inventory', 'ingredient_id'), s.strings('inventory', 'ingredient_name'))
+    frame = pd.DataFrame({'ingredient_name': names[ingredient[keep]], 'total_quantity_used': tenths[keep] / 10})
+    return _top(frame, 'total_quantity_used', 10)
+
+
+def _product_frame(s, product, column, values):
+    names = _lookup(s.col('products', 'product_id'), s.strings('products', 'product_name'))
+    return _top(pd.DataFrame({'product_id': product, 'product_name': names[product], column: values}), column, 10)
+
+
+def top10_products_sold(s):
+    product, _, units = _group(s.col('order_items', 'product_id'), s.col('order_items', 'quantity'))
+    return _product_frame(s, product, 'total_units_sold', units.astype(np.int64))
+
+
+def top10_products_by_revenue(s):
+    line_cents = s.col('order_items', 'quantity') * s.col('order_items', 'unit_price_cents')
+    product, _, cents = _group(s.col('order_items', 'product_id'), line_cents)
+    return _product_frame(s, product, 'product_revenue', cents / 100)
+
+
+def total_products(s):
+    return pd.DataFrame({'count': [s.rows('products')]})
+
+
+def total_sales(s):
+    return pd.DataFrame({'count': [s.rows('orders')]})
+
+
+def total_sales_money(s):
+    cents = s.col('orders', 'total_cents')
+    return pd.DataFrame({'sum': [int(cents.sum()) / 100 if len(cents) else None]})
+
+
+def menu_item(s):
+    _, count, _ = _group(s.col('product_recipe', 'product_id'))
+    return pd.DataFrame({'count': count})
+
+
+def peak_sales(s):
+    dates = s.col('orders', 'order_ts').astype('datetime64[s]').astype('datetime64[D]')
+    day_of_month = (dates - dates.astype('datetime64[M]')).astype(np.int64) + 1
+    _, _, cents = _group(day_of_month, s.col('orders', 'total_cents'))
+    return _top(pd.DataFrame({'total': cents / 100}), 'total', 10)
+
+
+def realistic_sales(s):
+    hours = s.col('orders', 'order_ts') % SECONDS_PER_DAY // 3600
+    _, _, cents = _group(hours, s.col('orders', 'total_cents'))
+    return pd.DataFrame({'sum': cents / 100})
+
+
+def weekly_sales(s):
+    _, count, _ = _group(_iso_week(_days(s.col('orders', 'order_ts'))))
+    return pd.DataFrame({'orders': count})
+
+
+# keyed like query_bench.discover_queries
+REPORTS = {
+    'avgOrderValuePerDay.sql': avg_order_value_per_day,
+    'cashierPerformance.sql': cashier_performance,
+    'firableEmployees.sql': firable_employees,
+    'noSupply.sql': no_supply,
+    'ordersAndRevenueByDay.sql': orders_and_revenue_by_day,
+    'salesByMonth.sql': sales_by_month,
+    'top10Ingredients.sql': top10_ingredients,
+    'top10ProdcutsSold.sql': top10_products_sold,
+    'top10ProductsByRevenue.sql': top10_products_by_revenue,
+    'totalProducts.sql': total_products,
+    'totalSales.sql': total_sales,
+    'totalSalesMoney.sql': total_sales_money,
+    'special/menuItem.sql': menu_item,
+    'special/peakSales.sql': peak_sales,
+    'special/realisticSales.sql': realistic_sales,
+    'special/weeklySales.sql': weekly_sales,
+}
+
+
+def run_reports(snapshot, names=None):
+    """{name: DataFrame} for the named reports (default: all of them)."""
+    return {name: REPORTS[name](snapshot) for name in names or REPORTS}
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description='Run the reports against a snapshot directory instead of the database')
+    p.add_argument('snapshot', help='directory written by snapshot.py')
+    p.add_argument('--only', nargs='+', metavar='NAME', help='report names as printed, e.g. special/peakSales.sql')
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    if not os.path.exists(os.path.join(args.snapshot, 'manifest.json')):
+        print(f'ERROR: {args.snapshot} has no manifest.json; export it with snapshot.py first')
+        return
+
+    t0 = time.perf_counter()
+    frames = run_reports(Snapshot(args.snapshot), args.only)
+    elapsed = time.perf_counter() - t0
+    for name, frame in frames.items():
+        print(f'\n== {name}')
+        print(frame.to_string(max_rows=20))
+    print(f'\n{len(frames)} reports in {elapsed:.2f}s')
+
+
+if __name__ == '__main__':
+    main()
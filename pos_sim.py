@@ -0,0 +1,284 @@
+"""Point-of-sale write load: N cashiers checking out orders concurrently.
+
+Each simulated register belongs to a Cashier employee and commits one
+order (items plus modifications) per short transaction, drawing products,
+quantities and times of day the way seeder.py does. Orders are dated
+today. Three ways of writing a checkout are compared:
+
+  orm       Session unit of work over Order/OrderItem/Modification
+  core      Core insert() ... RETURNING, items and modifications as executemany
+  multirow  one statement: data-modifying CTEs with multi-row VALUES
+
+The simulated orders are deleted afterwards unless --keep is given.
+"""
+import os
+import time
+import argparse
+import threading
+from datetime import datetime, timedelta, date
+from decimal import Decimal
+from typing import NamedTuple
+import numpy as np
+from dotenv import load_dotenv
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+import seeder
+import db_schema
+from db_schema import Order, OrderItem, Modification
+from query_bench import percentile
+
+DRAW_BATCH = 256
+LOCK_SAMPLE_SECONDS = 0.02
+
+
+class Checkout(NamedTuple):
+    order_date: datetime
+    total_cents: int
+    items: list               # (product_id, quantity, unit_cents, [(ingredient_id, type, quantity_change, price_cents)])
+
+
+def read_menu(engine):
+    """seeder.Menu for the catalog currently in the database."""
+    with engine.connect() as conn:
+        products = conn.exec_driver_sql('SELECT product_id, product_name, unit_price FROM products').all()
+        recipes = conn.exec_driver_sql('SELECT product_id, ingredient_id, quantity_per_unit FROM product_recipe').all()
+        inventory = conn.exec_driver_sql('SELECT ingredient_id FROM inventory').all()
+    return seeder.menu_arrays(products, recipes, inventory)
+
+
+def cashier_ids(engine):
+    with engine.connect() as conn:
+        return conn.exec_driver_sql("SELECT employee_id FROM employees WHERE role = 'Cashier' ORDER BY 1").scalars().all()
+
+
+def draw_checkouts(rng, menu, day, n=DRAW_BATCH):
+    """n checkouts on day, with seeder.py's product mix, line counts, modifications and opening hours."""
+    batch = seeder.draw_orders(rng, n, menu)
+    mods = {}
+    for item, ingredient, kind in zip(batch.mod_item.tolist(), batch.mod_ingredient.tolist(), batch.mod_type.tolist()):
+        quantity = seeder.MOD_QUANTITY[kind]
+        mods.setdefault(item, []).append((ingredient, seeder.MOD_TYPES[kind], Decimal(quantity) if quantity else None,
+                                          int(seeder.MOD_PRICE_CENTS[kind])))
+    ends = np.cumsum(batch.lines)
+    checkouts = []
+    for k in range(n):
+        items = [(int(batch.product_id[j]), int(batch.quantity[j]), int(batch.unit_cents[j]), mods.get(j, []))
+                 for j in range(ends[k] - batch.lines[k], ends[k])]
+        checkouts.append(Checkout(day + timedelta(minutes=int(batch.minute[k])), int(batch.total_cents[k]), items))
+    return checkouts
+
+
+def _money(cents):
+    return Decimal(cents) / 100
+
+
+def insert_orm(engine, employee_id, c):
+    """Returns the seconds spent in COMMIT."""
+    with Session(engine) as session:
+        session.add(Order(
+            order_date=c.order_date, total_amount=_money(c.total_cents), employee_id=employee_id,
+            items=[OrderItem(product_id=p, quantity=q, unit_price_at_sale=_money(u), modifications=[
+                Modification(ingredient_id=i, modification_type=t, quantity_change=qc, price_change=_money(pc))
+                for i, t, qc, pc in mods]) for p, q, u, mods in c.items],
+        ))
+        session.flush()
+        t0 = time.perf_counter()
+        session.commit()
+        return time.perf_counter() - t0
+
+
+ORDER_INSERT = insert(Order.__table__).returning(Order.__table__.c.order_id)
+ITEM_INSERT = insert(OrderItem.__table__).returning(OrderItem.__table__.c.order_item_id, sort_by_parameter_order=True)
+MOD_INSERT = insert(Modification.__table__)
+
+
+def insert_core(engine, employee_id, c):
+    with engine.connect() as conn:
+        order_id = conn.execute(ORDER_INSERT, {'order_date': c.order_date, 'total_amount': _money(c.total_cents),
+                                               'employee_id': employee_id}).scalar_one()
+        item_ids = conn.execute(ITEM_INSERT, [
+            {'order_id': order_id, 'order_date': c.order_date, 'product_id': p, 'quantity': q,
+             'unit_price_at_sale': _money(u)} for p, q, u, _ in c.items
+        ]).scalars().all()
+        mods = [{'order_item_id': item_id, 'ingredient_id': i, 'modification_type': t, 'quantity_change': qc,
+                 'price_change': _money(pc)}
+                for item_id, (_, _, _, item_mods) in zip(item_ids, c.items) for i, t, qc, pc in item_mods]
+        if mods:
+            conn.execute(MOD_INSERT, mods)
+        t0 = time.perf_counter()
+        conn.commit()
+        return time.perf_counter() - t0
+
+
+def multirow_sql(employee_id, c):
+    """The whole checkout as one statement. Every value is generated here, so literals are safe."""
+    lines = ', '.join(f'({n}, {p}, {q}, {_money(u)})' for n, (p, q, u, _) in enumerate(c.items))
+    sql = (
+        f"WITH o AS (INSERT INTO orders (order_date, total_amount, employee_id) "
+        f"VALUES ('{c.order_date:%Y-%m-%d %H:%M:%S}', {_money(c.total_cents)}, {employee_id}) "
+        f"RETURNING order_id, order_date), "
+        f"lines AS (SELECT nextval('order_items_order_item_id_seq')::int AS order_item_id, v.* "
+        f"FROM (VALUES {lines}) v(line, product_id, quantity, unit_price_at_sale)), "
+        f"i AS (INSERT INTO order_items (order_item_id, order_id, order_date, product_id, quantity, unit_price_at_sale) "
+        f"SELECT l.order_item_id, o.order_id, o.order_date, l.product_id, l.quantity, l.unit_price_at_sale "
+        f"FROM o, lines l)"
+    )
+    mods = ', '.join(
+        f"({n}, {i}, '{t}'::modification_type, {'NULL' if qc is None else qc}::numeric, {_money(pc)})"
+        for n, (_, _, _, item_mods) in enumerate(c.items) for i, t, qc, pc in item_mods
+    )
+    if mods:
+        sql += (
+            f", m AS (INSERT INTO modifications (order_item_id, ingredient_id, modification_type, quantity_change, "
+            f"price_change) SELECT l.order_item_id, v.ingredient_id, v.modification_type, v.quantity_change, "
+            f"v.price_change FROM lines l JOIN (VALUES {mods}) "
+            f"v(line, ingredient_id, modification_type, quantity_change, price_change) USING (line))"
+        )
+    return sql + ' SELECT order_id FROM o'
+
+
+def insert_multirow(engine, employee_id, c):
+    with engine.connect() as conn:
+        conn.exec_driver_sql(multirow_sql(employee_id, c))
+        t0 = time.perf_counter()
+        conn.commit()
+        return time.perf_counter() - t0
+
+
+STRATEGIES = {'orm': insert_orm, 'core': insert_core, 'multirow': insert_multirow}
+
+
+def cashier(engine, write, employee_id, rng, menu, day, stop_at, out):
+    """One register: check out orders back to back until stop_at; appends (txn s, commit s) or an error."""
+    checkouts = []
+    while time.perf_counter() < stop_at:
+        if not checkouts:
+            checkouts = draw_checkouts(rng, menu, day)
+        c = checkouts.pop()
+        t0 = time.perf_counter()
+        try:
+            commit_s = write(engine, employee_id, c)
+        except Exception as e:  # keep the other registers going; the count is reported
+            out.append(e)
+            continue
+        out.append((time.perf_counter() - t0, commit_s))
+
+
+def sample_lock_waits(engine, stop, samples):
+    """Poll pg_stat_activity for sessions of this database waiting on locks; one Counter-like dict per sample."""
+    sql = ("SELECT wait_event_type || ':' || wait_event, COUNT(*) FROM pg_stat_activity "
+           "WHERE datname = current_database() AND pid <> pg_backend_pid() AND state = 'active' "
+           "AND wait_event_type IN ('Lock', 'LWLock') GROUP BY 1")
+    with engine.connect() as conn:
+        while not stop.is_set():
+            samples.append(dict(conn.exec_driver_sql(sql).all()))
+            conn.rollback()
+            stop.wait(LOCK_SAMPLE_SECONDS)
+
+
+def simulate(engine, strategy, cashiers, seconds, seed=seeder.SEED):
+    """Run `cashiers` registers for `seconds` with one strategy and summarise the run."""
+    menu = read_menu(engine)
+    employees = cashier_ids(engine)
+    day = datetime.combine(date.today(), datetime.min.time())
+    write = STRATEGIES[strategy]
+    outs = [[] for _ in range(cashiers)]
+    samples, stop = [], threading.Event()
+    sampler = threading.Thread(target=sample_lock_waits, args=(engine, stop, samples))
+    sampler.start()
+    stop_at = time.perf_counter() + seconds
+    threads = [threading.Thread(target=cashier, args=(engine, write, employees[k % len(employees)],
+                                                      np.random.default_rng([seed, k]), menu, day, stop_at, outs[k]))
+               for k in range(cashiers)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    stop.set()
+    sampler.join()
+
+    done = [r for out in outs for r in out if not isinstance(r, Exception)]
+    errors = [r for out in outs for r in out if isinstance(r, Exception)]
+    waits = {}
+    for sample in samples:
+        for event_name, n in sample.items():
+            seen, peak = waits.get(event_name, (0, 0))
+            waits[event_name] = (seen + 1, max(peak, n))
+    ms = lambda values, pct: round(percentile(values, pct) * 1000, 2) if values else None
+    return {
+        'strategy': strategy, 'cashiers': cashiers, 'seconds': round(elapsed, 2),
+        'transactions': len(done), 'errors': len(errors), 'first_error': str(errors[0]).splitlines()[0] if errors else None,
+        'tps': round(len(done) / elapsed, 1),
+        'txn_p50_ms': ms([d[0] for d in done], 50), 'txn_p99_ms': ms([d[0] for d in done], 99),
+        'commit_p50_ms': ms([d[1] for d in done], 50), 'commit_p99_ms': ms([d[1] for d in done], 99),
+        'lock_samples': len(samples),
+        # event -> (samples it was seen in, most sessions waiting at once)
+        'lock_waits': waits,
+    }
+
+
+def max_order_id(engine):
+    with engine.connect() as conn:
+        return conn.exec_driver_sql('SELECT COALESCE(MAX(order_id), 0) FROM orders').scalar()
+
+
+def remove_orders_after(engine, order_id):
+    """Delete the simulated orders (everything past order_id) and their items and modifications."""
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            'DELETE FROM modifications m USING order_items oi '
+            f'WHERE m.order_item_id = oi.order_item_id AND oi.order_id > {int(order_id)}'
+        )
+        conn.exec_driver_sql(f'DELETE FROM order_items WHERE order_id > {int(order_id)}')
+        conn.exec_driver_sql(f'DELETE FROM orders WHERE order_id > {int(order_id)}')
+
+
+def print_result(r):
+    waits = ', '.join(f'{e} {seen}/{r["lock_samples"]} (max {peak})' for e, (seen, peak) in sorted(r['lock_waits'].items()))
+    print(f"{r['strategy']:<10}{r['cashiers']:>9}{r['transactions']:>8}{r['tps']:>9}"
+          f"{r['txn_p50_ms']:>10}{r['txn_p99_ms']:>10}{r['commit_p50_ms']:>11}{r['commit_p99_ms']:>11}{r['errors']:>8}"
+          f"  {waits or 'none'}")
+    if r['first_error']:
+        print(f"          first error: {r['first_error']}")
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description='Simulate concurrent cashiers writing orders and measure throughput')
+    p.add_argument('--url', help='SQLAlchemy database URL (overrides DATABASE_URL env)')
+    p.add_argument('--cashiers', type=int, nargs='+', default=[4], help='concurrent registers; several values = a sweep')
+    p.add_argument('--seconds', type=float, default=10, help='length of each run')
+    p.add_argument('--strategy', choices=[*STRATEGIES, 'all'], default='all')
+    p.add_argument('--keep', action='store_true', help='keep the simulated orders instead of deleting them')
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    load_dotenv()
+    db_url = args.url or os.environ.get('DATABASE_URL')
+
+    if not db_url:
+        print('ERROR: no database URL provided. Set DATABASE_URL or pass --url')
+        return
+
+    engine = db_schema.get_engine(db_url, pool_size=max(args.cashiers) + 1)
+    if db_schema.is_partitioned(engine):
+        db_schema.ensure_partitions(engine, date.today(), date.today())
+    strategies = list(STRATEGIES) if args.strategy == 'all' else [args.strategy]
+    print(f"{'strategy':<10}{'cashiers':>9}{'txns':>8}{'TPS':>9}{'p50 ms':>10}{'p99 ms':>10}"
+          f"{'commit p50':>11}{'commit p99':>11}{'errors':>8}  lock waits (samples seen / taken)")
+    for n in args.cashiers:
+        for strategy in strategies:
+            mark = max_order_id(engine)
+            try:
+                print_result(simulate(engine, strategy, n, args.seconds))
+            finally:
+                if not args.keep:
+                    remove_orders_after(engine, mark)
+
+
+if __name__ == '__main__':
+    main()
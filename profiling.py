@@ -0,0 +1,171 @@
+"""Phase timing for seeder.py/loader.py --profile.
+
+Code marks phases with `with profiling.span("name") as s: ... s.rows = n`.
+Spans are free no-ops unless a Profiler is active; nested spans are
+reported as "outer/inner", and a span entered repeatedly (once per chunk)
+accumulates. SQL run through an attached engine is timed per statement
+(client-observed, which for a local server is essentially server time)
+and charged to the innermost open span. COPYs through raw cursors bypass
+SQLAlchemy, so they only show up in their span's wall time.
+"""
+import sys
+import json
+import time
+import threading
+import cProfile
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, or None where unsupported."""
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class SpanRows:
+    rows = 0
+
+
+class Profiler:
+    def __init__(self):
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+        self.t0 = time.perf_counter()
+        self.spans = {}
+        self.stack = []
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name, rows=0):
+        path = "/".join(self.stack + [name])
+        with self.lock:
+            rec = self.spans.setdefault(path, {"seconds": 0.0, "calls": 0, "rows": 0, "statements": {}})
+        self.stack.append(name)
+        counter = SpanRows()
+        counter.rows = rows
+        t0 = time.perf_counter()
+        try:
+            yield counter
+        finally:
+            self.stack.pop()
+            with self.lock:
+                rec["seconds"] += time.perf_counter() - t0
+                rec["calls"] += 1
+                rec["rows"] += counter.rows
+                rec["peak_rss_mb"] = peak_rss_mb()
+
+    def attach(self, engine):
+        """Time every statement engine executes; safe to call more than once."""
+        # imported here so seeder.py (which never connects) doesn't need SQLAlchemy
+        from sqlalchemy import event
+
+        if event.contains(engine, "before_cursor_execute", self._before):
+            return
+        event.listen(engine, "before_cursor_execute", self._before)
+        event.listen(engine, "after_cursor_execute", self._after)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("profiling_t0", []).append(time.perf_counter())
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        seconds = time.perf_counter() - conn.info["profiling_t0"].pop()
+        key = " ".join(statement.split())[:120]
+        with self.lock:
+            # other threads' statements are charged to the main thread's open span
+            path = "/".join(self.stack) or "(no span)"
+            rec = self.spans.setdefault(path, {"seconds": 0.0, "calls": 0, "rows": 0, "statements": {}})
+            stmt = rec["statements"].setdefault(key, {"calls": 0, "seconds": 0.0})
+            stmt["calls"] += 1
+            stmt["seconds"] += seconds
+
+    def report(self, **meta):
+        spans = []
+        for path, rec in self.spans.items():
+            statements = sorted(rec["statements"].items(), key=lambda kv: -kv[1]["seconds"])
+            spans.append({
+                "span": path,
+                "seconds": round(rec["seconds"], 4),
+                "calls": rec["calls"],
+                "rows": rec["rows"],
+                "rows_per_s": round(rec["rows"] / rec["seconds"]) if rec["rows"] and rec["seconds"] else None,
+                "peak_rss_mb": rec.get("peak_rss_mb"),
+                "statements": [{"sql": sql, "calls": s["calls"], "seconds": round(s["seconds"], 4)}
+                               for sql, s in statements],
+            })
+        return {
+            "started_at": self.started_at,
+            "python": sys.version.split()[0],
+            **meta,
+            "total_seconds": round(time.perf_counter() - self.t0, 4),
+            "peak_rss_mb": peak_rss_mb(),
+            "spans": spans,
+        }
+
+    def write(self, path, **meta):
+        report = self.report(**meta)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, default=str)
+        return report
+
+
+def print_report(report):
+    print(f"\n{'span':<40}{'seconds':>10}{'rows':>11}{'rows/s':>11}{'rss MB':>9}")
+    for s in report["spans"]:
+        rate = f"{s['rows_per_s']:>11}" if s["rows_per_s"] else f"{'':>11}"
+        rss = f"{s['peak_rss_mb']:>9.0f}" if s["peak_rss_mb"] else f"{'':>9}"
+        print(f"{s['span']:<40}{s['seconds']:>10.3f}{s['rows'] or '':>11}{rate}{rss}")
+        for stmt in s["statements"][:3]:
+            print(f"    {stmt['seconds']:>8.3f}s x{stmt['calls']:<5} {stmt['sql'][:70]}")
+    print(f"total {report['total_seconds']:.2f}s, peak RSS {report['peak_rss_mb'] or 0:.0f} MB")
+
+
+_active = None
+
+
+def start():
+    global _active
+    _active = Profiler()
+    return _active
+
+
+def stop():
+    global _active
+    profiler, _active = _active, None
+    return profiler
+
+
+def span(name, rows=0):
+    if _active is None:
+        return _null_span()
+    return _active.span(name, rows)
+
+
+@contextmanager
+def _null_span():
+    yield SpanRows()
+
+
+def attach(engine):
+    if _active is not None:
+        _active.attach(engine)
+
+
+@contextmanager
+def cprofile(path):
+    """cProfile the block into path (pstats format) when path is set."""
+    if not path:
+        yield
+        return
+    prof = cProfile.Profile()
+    prof.enable()
+    try:
+        yield
+    finally:
+        prof.disable()
+        prof.dump_stats(path)
@@ -0,0 +1,11 @@
+SELECT 
+    i.ingredient_name,
+    u.total_quantity_used
+FROM (
+    SELECT ingredient_id, SUM(quantity_used) AS total_quantity_used
+    FROM ingredient_usage_daily
+    GROUP BY ingredient_id
+) u
+JOIN inventory i ON i.ingredient_id = u.ingredient_id
+ORDER BY total_quantity_used DESC
+LIMIT 10;
@@ -0,0 +1,4 @@
+SELECT sale_date AS order_day, SUM(revenue) / SUM(orders_count) AS avg_order_value
+FROM sales_hourly
+GROUP BY order_day
+ORDER BY order_day;
\ No newline at end of file
@@ -0,0 +1,5 @@
+SELECT EXTRACT(ISODOW FROM sale_date) AS iso_dow, TO_CHAR(sale_date, 'Dy') AS weekday,
+       SUM(orders_count)::bigint AS orders_count, SUM(revenue) AS revenue
+FROM sales_hourly
+GROUP BY iso_dow, weekday
+ORDER BY iso_dow;
\ No newline at end of file
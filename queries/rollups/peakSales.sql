@@ -0,0 +1 @@
+SELECT SUM(revenue) AS total FROM sales_hourly GROUP BY EXTRACT(DAY FROM sale_date) ORDER BY total DESC LIMIT 10;
\ No newline at end of file
@@ -0,0 +1 @@
+SELECT SUM(revenue) FROM sales_hourly GROUP BY sale_hour;
\ No newline at end of file
@@ -0,0 +1 @@
+SELECT SUM(orders_count)::bigint as orders FROM sales_hourly GROUP BY EXTRACT(MONTH FROM sale_date);
\ No newline at end of file
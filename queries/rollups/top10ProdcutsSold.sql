@@ -0,0 +1,6 @@
+SELECT p.product_id, p.product_name, SUM(psd.units_sold)::bigint AS total_units_sold
+FROM product_sales_daily psd
+JOIN products p ON p.product_id = psd.product_id
+GROUP BY p.product_id, p.product_name
+ORDER BY total_units_sold DESC
+LIMIT 10;
\ No newline at end of file
@@ -0,0 +1,6 @@
+SELECT p.product_id, p.product_name, SUM(psd.revenue) AS product_revenue
+FROM product_sales_daily psd
+JOIN products p ON p.product_id = psd.product_id
+GROUP BY p.product_id, p.product_name
+ORDER BY product_revenue DESC
+LIMIT 10;
\ No newline at end of file
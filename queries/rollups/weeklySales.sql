@@ -0,0 +1 @@
+SELECT SUM(orders_count)::bigint AS orders FROM sales_hourly GROUP BY EXTRACT(WEEK FROM sale_date);
\ No newline at end of file
@@ -0,0 +1,162 @@
+import os
+import sys
+import json
+import time
+import argparse
+from dotenv import load_dotenv
+from sqlalchemy.exc import DBAPIError
+
+import db_schema
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+QUERY_DIR = os.path.join(BASE_DIR, 'queries')
+
+
+def discover_queries(query_dir=QUERY_DIR):
+    """Every .sql file under query_dir, keyed by relative path (e.g. 'special/peakSales.sql')."""
+    queries = {}
+    for root, _, files in os.walk(query_dir):
+        for name in files:
+            if name.endswith('.sql'):
+                path = os.path.join(root, name)
+                with open(path, encoding='utf-8') as f:
+                    queries[os.path.relpath(path, query_dir).replace(os.sep, '/')] = f.read().strip().rstrip(';')
+    return dict(sorted(queries.items()))
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile; fine for the handful of runs we take."""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def bench_query(conn, sql, runs):
+    """Time sql runs times (after one warm-up) and collect buffer usage from one EXPLAIN ANALYZE."""
+    conn.exec_driver_sql(sql).fetchall()
+    times = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        rows = conn.exec_driver_sql(sql).fetchall()
+        times.append((time.perf_counter() - t0) * 1000)
+    plan = conn.exec_driver_sql(f'EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}').scalar()[0]
+    return {
+        'p50_ms': round(percentile(times, 50), 3),
+        'p95_ms': round(percentile(times, 95), 3),
+        'rows': len(rows),
+        'server_ms': plan['Execution Time'],
+        'shared_hit': plan['Plan'].get('Shared Hit Blocks', 0),
+        'shared_read': plan['Plan'].get('Shared Read Blocks', 0),
+    }
+
+
+def run_suite(engine, queries, runs):
+    results = {}
+    with engine.connect() as conn:
+        for name, sql in queries.items():
+            try:
+                results[name] = bench_query(conn, sql, runs)
+            except DBAPIError as e:
+                conn.rollback()
+                results[name] = {'error': str(e.orig).strip().splitlines()[0]}
+            conn.rollback()
+    return results
+
+
+def table_sizes(engine):
+    with engine.connect() as conn:
+        return {t: conn.exec_driver_sql(f'SELECT COUNT(*) FROM {t}').scalar() for t in ('orders', 'order_items')}
+
+
+def reseed(url, sales_target=None, scale_factor=1.0):
+    """Drop everything and rebuild the database at the given sales target or scale factor."""
+    import loader
+
+    engine = db_schema.get_engine(url)
+    db_schema.Base.metadata.drop_all(engine)
+    db_schema.create_tables(engine)
+    db_schema.fill_baseInfo(url)
+    loader.load(url, sales_target=sales_target, scale_factor=scale_factor)
+
+
+def find_regressions(baseline, current, threshold, min_ms):
+    """Queries whose p50 grew by more than threshold x (and min_ms) over the baseline at the same scale."""
+    found = []
+    for scale, result in current['scales'].items():
+        base_queries = baseline.get('scales', {}).get(scale, {}).get('queries', {})
+        for name, now in result['queries'].items():
+            before = base_queries.get(name)
+            if not before or 'error' in before:
+                continue
+            if 'error' in now:
+                found.append(f'{scale} {name}: now fails ({now["error"]})')
+            elif now['p50_ms'] > before['p50_ms'] * threshold and now['p50_ms'] - before['p50_ms'] > min_ms:
+                found.append(f'{scale} {name}: p50 {before["p50_ms"]:.1f} -> {now["p50_ms"]:.1f} ms')
+    return found
+
+
+def print_results(scale, result):
+    print(f'\n== scale {scale}: {result["sizes"]["orders"]} orders, {result["sizes"]["order_items"]} order items')
+    print(f'{"query":<36}{"p50 ms":>10}{"p95 ms":>10}{"rows":>8}{"hit":>10}{"read":>10}')
+    for name, r in result['queries'].items():
+        if 'error' in r:
+            print(f'{name:<36}  ERROR {r["error"]}')
+        else:
+            print(f'{name:<36}{r["p50_ms"]:>10.1f}{r["p95_ms"]:>10.1f}{r["rows"]:>8}{r["shared_hit"]:>10}{r["shared_read"]:>10}')
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description='Benchmark every report in queries/ and check for regressions')
+    p.add_argument('--url', help='SQLAlchemy database URL (overrides DATABASE_URL env)')
+    p.add_argument('--runs', type=int, default=5, help='timed runs per query')
+    p.add_argument('--reseed', type=float, nargs='+', metavar='SALES_TARGET',
+                   help='rebuild the database at each sales target and measure each (DESTROYS existing data)')
+    p.add_argument('--scale-factors', type=float, nargs='+', metavar='SF',
+                   help='like --reseed, but rebuild at each seeder --scale-factor (e.g. 1 10 100)')
+    p.add_argument('--save', help='write results to this JSON file')
+    p.add_argument('--baseline', help='JSON file from an earlier --save to compare against')
+    p.add_argument('--threshold', type=float, default=1.25, help='allowed p50 growth factor over the baseline')
+    p.add_argument('--min-ms', type=float, default=2.0, help='ignore regressions smaller than this many ms')
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    load_dotenv()
+    db_url = args.url or os.environ.get('DATABASE_URL')
+
+    if not db_url:
+        print('ERROR: no database URL provided. Set DATABASE_URL or pass --url')
+        return 2
+
+    queries = discover_queries()
+    current = {'runs': args.runs, 'scales': {}}
+    runs = [(f'{t:.0f}', {'sales_target': t}) for t in args.reseed or []]
+    runs += [(f'sf{sf:g}', {'scale_factor': sf}) for sf in args.scale_factors or []]
+    for scale, reseed_args in runs or [('current', None)]:
+        if reseed_args is not None:
+            reseed(db_url, **reseed_args)
+        engine = db_schema.get_engine(db_url)
+        current['scales'][scale] = {'sizes': table_sizes(engine), 'queries': run_suite(engine, queries, args.runs)}
+        print_results(scale, current['scales'][scale])
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(current, f, indent=2)
+        print(f'\nSaved results to {args.save}')
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = find_regressions(baseline, current, args.threshold, args.min_ms)
+        if regressions:
+            print(f'\n{len(regressions)} regression(s) past {args.threshold}x:')
+            for line in regressions:
+                print('  ' + line)
+            return 1
+        print(f'\nNo regressions against {args.baseline}.')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""Report results cached until the tables they read change.
+
+A result is stored with the watermarks of the tables its SQL names. The
+watermark is the table's change_counters version (bumped by trigger), plus
+MAX(id) for the append-only tables, and all of them come back in one
+indexed round trip. Watermarks are read before the report runs, so a
+change that lands mid-query only causes an extra miss next time.
+
+Keys also include the database's identity: the cluster's system
+identifier, the database name and the schema_instance nonce written each
+time the tables are created. Another database, or this one rebuilt with a
+different seed or roster, never hits results cached from the old one,
+even in the disk tier and with identical row counts.
+
+An order committed out of id order after a newer one was already counted
+is not noticed until the next order arrives; for dashboards that is fine.
+
+The disk tier is pickles, and unpickling runs whatever the file says, so
+disk_dir is trusted like code: it is created owner-only (0700), and an
+existing directory that belongs to someone else or that others can write to
+is refused rather than read.
+"""
+import os
+import re
+import json
+import pickle
+import hashlib
+import threading
+from collections import OrderedDict
+
+import db_schema
+
+
+def tables_in(sql):
+    """Names of the schema tables mentioned in sql, sorted."""
+    words = set(re.findall(r'[a-z_]+', sql.lower()))
+    return sorted(words & {t.name for t in db_schema.Base.metadata.sorted_tables})
+
+
+DATABASE = '(database)'  # the identity's entry among the watermarks
+IDENTITY_SQL = ("(SELECT system_identifier::text FROM pg_control_system()) || '/' || current_database() || '/' "
+                "|| COALESCE((SELECT instance_id FROM schema_instance), '')")
+
+
+def watermark_sql(tables):
+    columns = [IDENTITY_SQL]
+    for table in tables:
+        columns.append(f"(SELECT version FROM change_counters WHERE table_name = '{table}')")
+        if table in db_schema.APPEND_ONLY_IDS:
+            columns.append(f'(SELECT MAX({db_schema.APPEND_ONLY_IDS[table]}) FROM {table})')
+    return 'SELECT ' + ', '.join(columns)
+
+
+def private_dir(path):
+    """Create path owner-only, or check an existing one is ours and writable by no one else."""
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    st = os.stat(path)
+    if (hasattr(os, 'getuid') and st.st_uid != os.getuid()) or st.st_mode & 0o022:
+        raise ValueError(f'{path}: cache directory must be owned by this user and not group/world-writable')
+    return path
+
+
+def cache_key(sql, params=None, database=None):
+    text = json.dumps([database, sql, params or {}], sort_keys=True, default=str)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class ReportCache:
+    """In-memory LRU of DataFrames, optionally backed by a size-capped directory of pickles."""
+
+    def __init__(self, engine, max_entries=256, disk_dir=None, disk_max_bytes=256 * 2**20):
+        self.engine = engine
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+        self.memory = OrderedDict()  # key -> (marks, frame)
+        self.counts = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'stale': 0}
+        self.lock = threading.Lock()
+        if disk_dir:
+            private_dir(disk_dir)
+
+    def watermarks(self, tables):
+        """{table: watermark} for tables plus {DATABASE: identity}, in a single query."""
+        tables = sorted(set(tables))
+        with self.engine.connect() as conn:
+            row = conn.exec_driver_sql(watermark_sql(tables)).one()
+        values = iter(row)
+        marks = {DATABASE: next(values)}
+        marks.update({t: (next(values), next(values)) if t in db_schema.APPEND_ONLY_IDS else next(values)
+                      for t in tables})
+        return marks
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, f'{key}.pkl')
+
+    def lookup(self, sql, params, marks):
+        """The cached frame if it was computed at the current watermarks of sql's tables, else None."""
+        key = cache_key(sql, params, marks[DATABASE])
+        wanted = {t: marks[t] for t in tables_in(sql)}
+        stale = False
+        with self.lock:
+            entry = self.memory.get(key)
+            if entry is not None:
+                if entry[0] == wanted:
+                    self.memory.move_to_end(key)
+                    self.counts['memory_hits'] += 1
+                    return entry[1]
+                del self.memory[key]
+                stale = True
+            if self.disk_dir and os.path.exists(self._disk_path(key)):
+                with open(self._disk_path(key), 'rb') as f:
+                    stored_marks, frame = pickle.load(f)
+                if stored_marks == wanted:
+                    os.utime(self._disk_path(key))
+                    self._remember(key, wanted, frame)
+                    self.counts['disk_hits'] += 1
+                    return frame
+                os.remove(self._disk_path(key))
+                stale = True
+            self.counts['misses'] += 1
+            self.counts['stale'] += stale
+            return None
+
+    def store(self, sql, params, marks, frame):
+        key = cache_key(sql, params, marks[DATABASE])
+        wanted = {t: marks[t] for t in tables_in(sql)}
+        with self.lock:
+            self._remember(key, wanted, frame)
+            if self.disk_dir:
+                tmp = self._disk_path(key) + '.tmp'
+                with open(tmp, 'wb') as f:
+                    pickle.dump((wanted, frame), f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp, self._disk_path(key))
+                self._evict_disk()
+
+    def _remember(self, key, marks, frame):
+        self.memory[key] = (marks, frame)
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+
+    def _evict_disk(self):
+        """Remove least recently used files until the directory fits disk_max_bytes."""
+        entries = []
+        for name in os.listdir(self.disk_dir):
+            if name.endswith('.pkl'):
+                st = os.stat(os.path.join(self.disk_dir, name))
+                entries.append((st.st_mtime, st.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.disk_max_bytes:
+                break
+            os.remove(os.path.join(self.disk_dir, name))
+            total -= size
+
+    def frame(self, sql, run, params=None):
+        """One report through the cache; run(sql, params) computes it on a miss."""
+        marks = self.watermarks(tables_in(sql))
+        frame = self.lookup(sql, params, marks)
+        if frame is None:
+            frame = run(sql, params)
+            self.store(sql, params, marks, frame)
+        return frame
+
+    def stats(self):
+        """Hit/miss counts and hit rate; stale counts the misses caused by a changed watermark."""
+        with self.lock:
+            stats = dict(self.counts)
+        hits = stats['memory_hits'] + stats['disk_hits']
+        lookups = hits + stats['misses']
+        stats['hit_rate'] = hits / lookups if lookups else 0.0
+        return stats
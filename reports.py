@@ -0,0 +1,98 @@
+import os
+import time
+import asyncio
+import argparse
+import pandas as pd
+from dotenv import load_dotenv
+from sqlalchemy import text
+
+import db_schema
+from query_bench import discover_queries
+from report_cache import ReportCache, tables_in
+
+
+def read_frame(engine, sql, params=None):
+    """Run one report on its own pooled connection and return it as a DataFrame."""
+    with engine.connect() as conn:
+        result = conn.execute(text(sql), params) if params else conn.exec_driver_sql(sql)
+        return pd.DataFrame(result.fetchall(), columns=list(result.keys()))
+
+
+async def run_reports_async(engine, queries=None, concurrency=None, return_exceptions=False, cache=None):
+    """Run every report at once, at most concurrency at a time (default: the pool size).
+
+    psycopg2 blocks, so each query runs in a worker thread; the event loop
+    only schedules them. Returns {name: DataFrame}, or the exception in
+    place of the frame for failed reports when return_exceptions is set.
+    With a ReportCache, the watermarks for the whole set are read once and
+    only the reports whose tables changed are run; its lookups and stores
+    touch the disk tier, so they run in worker threads too.
+    """
+    if queries is None:
+        queries = discover_queries()
+    limit = asyncio.Semaphore(concurrency or engine.pool.size())
+    if cache is not None:
+        tables = {t for sql in queries.values() for t in tables_in(sql)}
+        marks = await asyncio.to_thread(cache.watermarks, tables)
+
+    async def run(sql):
+        if cache is not None:
+            frame = await asyncio.to_thread(cache.lookup, sql, None, marks)
+            if frame is not None:
+                return frame
+        async with limit:
+            frame = await asyncio.to_thread(read_frame, engine, sql)
+        if cache is not None:
+            await asyncio.to_thread(cache.store, sql, None, marks, frame)
+        return frame
+
+    frames = await asyncio.gather(*(run(sql) for sql in queries.values()), return_exceptions=return_exceptions)
+    return dict(zip(queries, frames))
+
+
+def run_reports(engine, queries=None, concurrency=None, return_exceptions=False, cache=None):
+    """Blocking wrapper around run_reports_async for scripts and notebooks without a running loop."""
+    return asyncio.run(run_reports_async(engine, queries, concurrency, return_exceptions, cache))
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description='Run the queries/ reports concurrently and print each result')
+    p.add_argument('--url', help='SQLAlchemy database URL (overrides DATABASE_URL env)')
+    p.add_argument('--only', nargs='+', metavar='NAME', help='report names as printed, e.g. special/peakSales.sql')
+    p.add_argument('--concurrency', type=int, help='reports in flight at once (default: pool size)')
+    p.add_argument('--pool-size', type=int, help='connection pool size (default: DB_POOL_SIZE or 5)')
+    p.add_argument('--statement-timeout-ms', type=int, help='cancel any report running longer than this')
+    p.add_argument('--cache-dir', help='reuse results stored here while their tables are unchanged')
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    load_dotenv()
+    db_url = args.url or os.environ.get('DATABASE_URL')
+
+    if not db_url:
+        print('ERROR: no database URL provided. Set DATABASE_URL or pass --url')
+        return
+
+    engine = db_schema.get_engine(db_url, pool_size=args.pool_size, statement_timeout_ms=args.statement_timeout_ms)
+    queries = discover_queries()
+    if args.only:
+        queries = {name: queries[name] for name in args.only}
+
+    cache = ReportCache(engine, disk_dir=args.cache_dir) if args.cache_dir else None
+    t0 = time.perf_counter()
+    frames = run_reports(engine, queries, args.concurrency, return_exceptions=True, cache=cache)
+    elapsed = time.perf_counter() - t0
+    for name, frame in frames.items():
+        print(f'\n== {name}')
+        print(f'ERROR {str(frame).splitlines()[0]}' if isinstance(frame, Exception) else frame.to_string(max_rows=20))
+    print(f'\n{len(frames)} reports in {elapsed:.2f}s')
+    if cache is not None:
+        stats = cache.stats()
+        print(f"cache: {stats['memory_hits'] + stats['disk_hits']} hits, {stats['misses']} misses "
+              f"({stats['stale']} stale), hit rate {stats['hit_rate']:.0%}")
+
+
+if __name__ == '__main__':
+    main()
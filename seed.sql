@@ -0,0 +1,60 @@
+BEGIN;
+SET synchronous_commit = off;
+
+CREATE UNLOGGED TABLE IF NOT EXISTS employees_stage (employee_id integer, name text, role text);
+CREATE UNLOGGED TABLE IF NOT EXISTS inventory_stage (ingredient_id integer, ingredient_name text, on_hand_quantity numeric(10,1));
+CREATE UNLOGGED TABLE IF NOT EXISTS products_stage (product_id integer, product_name text, unit_price numeric(10,2));
+CREATE UNLOGGED TABLE IF NOT EXISTS product_recipe_stage (product_id integer, ingredient_id integer, quantity_per_unit numeric(10,1));
+CREATE UNLOGGED TABLE IF NOT EXISTS orders_stage (order_id integer, order_date timestamp, total_amount numeric(10,2), employee_id integer);
+CREATE UNLOGGED TABLE IF NOT EXISTS order_items_stage (order_item_id integer, order_id integer, order_date timestamp, product_id integer, quantity integer, unit_price_at_sale numeric(10,2));
+CREATE UNLOGGED TABLE IF NOT EXISTS modifications_stage (modification_id integer, order_item_id integer, ingredient_id integer, modification_type text, quantity_change numeric(10,1), price_change numeric(10,2));
+
+\copy employees_stage (employee_id, name, role) FROM '/tmp/b/employees_stage.csv' CSV HEADER;
+\copy inventory_stage (ingredient_id, ingredient_name, on_hand_quantity) FROM '/tmp/b/inventory_stage.csv' CSV HEADER;
+\copy products_stage (product_id, product_name, unit_price) FROM '/tmp/b/products_stage.csv' CSV HEADER;
+\copy product_recipe_stage (product_id, ingredient_id, quantity_per_unit) FROM '/tmp/b/product_recipe_stage.csv' CSV HEADER;
+\copy orders_stage (order_id, order_date, total_amount, employee_id) FROM '/tmp/b/orders_stage.csv' CSV HEADER;
+\copy order_items_stage (order_item_id, order_id, order_date, product_id, quantity, unit_price_at_sale) FROM '/tmp/b/order_items_stage.csv' CSV HEADER;
+\copy modifications_stage (modification_id, order_item_id, ingredient_id, modification_type, quantity_change, price_change) FROM '/tmp/b/modifications_stage.csv' CSV HEADER;
+
+INSERT INTO employees (employee_id, name, role)
+SELECT employee_id, name, role::employee_role FROM employees_stage
+ON CONFLICT (employee_id) DO UPDATE SET name = EXCLUDED.name, role = EXCLUDED.role;
+
+INSERT INTO inventory (ingredient_id, ingredient_name, on_hand_quantity)
+SELECT ingredient_id, ingredient_name, on_hand_quantity FROM inventory_stage
+ON CONFLICT (ingredient_id) DO NOTHING;
+
+INSERT INTO products (product_id, product_name, unit_price)
+SELECT product_id, product_name, unit_price FROM products_stage
+ON CONFLICT (product_id) DO UPDATE SET product_name = EXCLUDED.product_name, unit_price = EXCLUDED.unit_price;
+
+INSERT INTO orders (order_id, order_date, total_amount, employee_id)
+SELECT order_id, order_date, total_amount, employee_id FROM orders_stage;
+
+INSERT INTO product_recipe (product_id, ingredient_id, quantity_per_unit)
+SELECT product_id, ingredient_id, quantity_per_unit FROM product_recipe_stage
+ON CONFLICT (product_id, ingredient_id) DO NOTHING;
+
+INSERT INTO order_items (order_item_id, order_id, order_date, product_id, quantity, unit_price_at_sale)
+SELECT order_item_id, order_id, order_date, product_id, quantity, unit_price_at_sale FROM order_items_stage;
+
+INSERT INTO modifications (modification_id, order_item_id, ingredient_id, modification_type, quantity_change, price_change)
+SELECT modification_id, order_item_id, ingredient_id, modification_type::modification_type, quantity_change, price_change
+FROM modifications_stage;
+
+DROP TABLE employees_stage;
+DROP TABLE inventory_stage;
+DROP TABLE products_stage;
+DROP TABLE product_recipe_stage;
+DROP TABLE orders_stage;
+DROP TABLE order_items_stage;
+DROP TABLE modifications_stage;
+
+SELECT setval('employees_employee_id_seq', (SELECT COALESCE(MAX(employee_id),0) + 1 FROM employees), false);
+SELECT setval('inventory_ingredient_id_seq', (SELECT COALESCE(MAX(ingredient_id),0) + 1 FROM inventory), false);
+SELECT setval('products_product_id_seq', (SELECT COALESCE(MAX(product_id),0) + 1 FROM products), false);
+SELECT setval('orders_order_id_seq', (SELECT COALESCE(MAX(order_id),0) + 1 FROM orders), false);
+SELECT setval('order_items_order_item_id_seq', (SELECT COALESCE(MAX(order_item_id),0) + 1 FROM order_items), false);
+SELECT setval('modifications_modification_id_seq', (SELECT COALESCE(MAX(modification_id),0) + 1 FROM modifications), false);
+COMMIT;
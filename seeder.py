@@ -1,164 +1,770 @@
-import os, csv, random
+"""Synthetic order history for the database, as a library and a CLI.
+
+    import seeder
+    for batch in seeder.generate(seeder.Config(scale_factor=2, seed=7)):
+        print(batch.table, len(batch.rows))
+
+Importing has no side effects and only needs numpy and the stdlib: the
+catalog CSVs are read with csv, and pandas (legacy load_products), the
+binary artifact writer and the process pool are imported when used.
+python seeder.py writes the staging files and seed.sql; see --help.
+"""
+import os, io, csv, time, argparse
+from collections import deque
 from datetime import datetime, timedelta
-import pandas as pd
+from typing import NamedTuple
+import numpy as np
+
+import catalog
+import profiling
+from profiling import peak_rss_mb
 
 TOTAL_SALES_TARGET = 1_000_000.00
 START_DATE = datetime(2024, 9, 26)
 END_DATE = datetime(2025, 9, 26)
-CSV_PATH = "data.csv"
 OUTPUT_SQL = "seed.sql"
-random.seed(42)
+SEED = 42
+
+OPEN_HOUR, CLOSE_HOUR = 7, 20
+MAX_LINES_PER_ORDER = 4
+MAX_QTY_PER_LINE = 5
+SPECIAL_DAYS = {(11, 30), (12, 25)}
+SPECIAL_DAY_MIN_SALES = 5000
+CHUNK_DAYS = 30
+CHUNK_ORDERS = 20_000
+
+MODIFICATION_RATE = 0.15    # share of order items with a modification
+ADD_ON_CENTS = 50
+MOD_TYPES = ("ADD", "REMOVE", "LESS", "EXTRA")
+MOD_QUANTITY = ("1.0", "", "0.5", "1.0")  # quantity_change by type; REMOVE leaves it NULL
+MOD_QUANTITY_TENTHS = np.ma.masked_array([round(float(q) * 10) if q else 0 for q in MOD_QUANTITY],
+                                         mask=[not q for q in MOD_QUANTITY])
+# price_change by type, charged per unit of the item like its unit price
+MOD_PRICE_CENTS = np.array([ADD_ON_CENTS, 0, 0, ADD_ON_CENTS], dtype=np.int64)
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-PRODUCTS_STAGE_CSV = os.path.join(BASE_DIR, "products_stage.csv")
-ORDERS_STAGE_CSV = os.path.join(BASE_DIR, "orders_stage.csv")
-ORDER_ITEMS_STAGE_CSV = os.path.join(BASE_DIR, "order_items_stage.csv")
-PRODUCT_RECIPE_STAGE_CSV = os.path.join(BASE_DIR, "product_recipe_stage.csv")
-
-df = pd.read_csv(CSV_PATH)
-if "name" in df.columns:
-    df.rename(columns={"name": "product_name"}, inplace=True)
-if "unit_price" not in df.columns and "price" in df.columns:
-    df.rename(columns={"price": "unit_price"}, inplace=True)
-df["product_name"] = df["product_name"].astype(str).str.strip()
-df["unit_price"] = df["unit_price"].astype(str).str.replace("$", "", regex=False).str.strip().astype(float)
-if "fruit" in df.columns:
-    df["fruit"] = df["fruit"].astype(str).str.strip().str.lower()
-if "tea" in df.columns:
-    df["tea"] = df["tea"].astype(str).str.strip().str.lower().replace({
-        "milk": "milk tea", "milk tea": "milk tea",
-        "green": "green tea", "green tea": "green tea",
-    })
-df = df.reset_index(drop=True)
-df["product_id"] = df.index + 1
-
-with open(PRODUCTS_STAGE_CSV, "w", newline="", encoding="utf-8") as c:
-    w = csv.writer(c); w.writerow(["product_id", "product_name", "unit_price"])
-    for _, r in df.iterrows():
-        w.writerow([int(r["product_id"]), r["product_name"], f"{float(r['unit_price']):.2f}"])
-
-prs_rows = []
-for _, r in df.iterrows():
-    pid = int(r["product_id"])
-    fruit = str(r.get("fruit", "")).strip().lower()
-    tea = str(r.get("tea", "")).strip().lower()
-    if fruit:
-        prs_rows.append([pid, fruit, "1.0"])
-    if tea:
-        prs_rows.append([pid, tea, "1.0"])
-with open(PRODUCT_RECIPE_STAGE_CSV, "w", newline="", encoding="utf-8") as c:
-    w = csv.writer(c); w.writerow(["product_id", "ingredient_name", "quantity_per_unit"])
-    w.writerows(prs_rows)
-
-days = (END_DATE - START_DATE).days + 1
-avg_price = float(df["unit_price"].mean())
-expected_items_per_order = (1 + 4) / 2.0
-expected_qty_per_line = (1 + 5) / 2.0
-expected_order_value = avg_price * expected_items_per_order * expected_qty_per_line
-total_orders = max(1, int(TOTAL_SALES_TARGET / expected_order_value))
-orders_per_day = total_orders // days
-remainder_days = total_orders % days
-
-orders_rows, order_items_rows = [], []
-order_id, order_item_id = 1, 1
-for d in range(days):
-    day = START_DATE + timedelta(days=d)
-    if (day.month == 11 and day.day == 30) or (day.month == 12 and day.day == 25):
-        daily_total = 0.0
-        while daily_total < 5000:
-            hour = random.randint(7, 20)
-            minute = random.randint(0, 59)
-            ts = day.replace(hour=hour, minute=minute, second=0)
-            num_lines = random.randint(1, 4)
-            order_total = 0.0
-            lines = []
-            for _ in range(num_lines):
-                prod = df.sample(n=1).iloc[0]
-                pid = int(prod["product_id"])
-                base_price = float(prod["unit_price"])
-                qty = random.randint(1, 5)
-                unit_price_at_sale = round(base_price, 2)
-                order_total += unit_price_at_sale * qty
-                lines.append((order_item_id, order_id, pid, qty, f"{unit_price_at_sale:.2f}"))
-                order_item_id += 1
-            orders_rows.append([order_id, ts.strftime("%Y-%m-%d %H:%M:%S"), f"{order_total:.2f}"])
-            for row in lines:
-                order_items_rows.append(list(row))
-            order_id += 1
-            daily_total += order_total
+CSV_PATH = os.path.join(BASE_DIR, "data.csv")
+
+def stage_path(name, out_dir=BASE_DIR):
+    return os.path.join(out_dir, f"{name}_stage.csv")
+
+
+class OrderBatch(NamedTuple):
+    """Generated orders as parallel arrays; ids are assigned when rows are emitted."""
+    day: np.ndarray             # day offset from the start date, per order
+    minute: np.ndarray          # minute of the day, per order
+    lines: np.ndarray           # number of order items, per order
+    total_cents: np.ndarray     # order total including add-ons, per order
+    employee_id: np.ndarray     # cashier on shift who rang it up, per order (0 without a roster)
+    product_id: np.ndarray      # per item
+    quantity: np.ndarray        # per item
+    unit_cents: np.ndarray      # per item
+    mod_item: np.ndarray        # per modification: index of its item in this batch
+    mod_ingredient: np.ndarray  # per modification
+    mod_type: np.ndarray        # per modification: index into MOD_TYPES
+
+    def __len__(self):
+        return len(self.day)
+
+
+class Roster(NamedTuple):
+    """catalog.read_roster() lines as arrays; line j is worked by employee_ids[store, j]."""
+    employee_ids: np.ndarray    # (stores, lines)
+    start: np.ndarray           # first minute of the day, per line
+    end: np.ndarray             # minute the shift ends (exclusive), per line
+    weekdays: np.ndarray        # (lines, 7) bool
+
+
+class Menu(NamedTuple):
+    """The catalog and cashier roster as arrays for the generator.
+
+    Product i's recipe is recipe_ingredients[recipe_offsets[i]:recipe_offsets[i + 1]].
+    Products and ingredients come in catalog.stores(scale_factor) equal
+    blocks, one per store; an order only uses its own store's.
+    """
+    product_ids: np.ndarray
+    prices_cents: np.ndarray
+    recipe_offsets: np.ndarray
+    recipe_ingredients: np.ndarray
+    ingredient_ids: np.ndarray
+    scale_factor: float = 1.0
+    roster: Roster | None = None
+
+
+class Config(NamedTuple):
+    """What to generate; the defaults are the standard dataset. format is "csv" or "binary" (seeder.py only)."""
+    start: datetime = START_DATE
+    end: datetime = END_DATE
+    scale_factor: float = 1.0
+    sales_target: float | None = None
+    chunk_days: int = CHUNK_DAYS
+    chunk_orders: int = CHUNK_ORDERS
+    workers: int = 1
+    seed: int = SEED
+    format: str = "csv"
+
+
+class RowBatch(NamedTuple):
+    """Rows for one stage table, in STAGE_COLUMNS order."""
+    table: str
+    rows: list
+
+
+class Chunk(NamedTuple):
+    """Rendered rows for one run of days (CSV text, or binary COPY tuples as bytes) and their counts."""
+    orders: str | bytes
+    items: str | bytes
+    mods: str | bytes
+    n_orders: int
+    n_items: int
+    n_mods: int
+
+
+def load_products(path=CSV_PATH):
+    """data.csv as a DataFrame; only the legacy loop in benchmarks/seed_generation.py still uses it."""
+    import pandas as pd
+
+    df = pd.read_csv(path)
+    if "name" in df.columns:
+        df.rename(columns={"name": "product_name"}, inplace=True)
+    if "unit_price" not in df.columns and "price" in df.columns:
+        df.rename(columns={"price": "unit_price"}, inplace=True)
+    df["product_name"] = df["product_name"].astype(str).str.strip()
+    df["unit_price"] = df["unit_price"].astype(str).str.replace("$", "", regex=False).str.strip().astype(float)
+    if "fruit" in df.columns:
+        df["fruit"] = df["fruit"].astype(str).str.strip().str.lower()
+    if "tea" in df.columns:
+        df["tea"] = df["tea"].astype(str).str.strip().str.lower().replace({
+            "milk": "milk tea", "milk tea": "milk tea",
+            "green": "green tea", "green tea": "green tea",
+        })
+    df = df.reset_index(drop=True)
+    df["product_id"] = df.index + 1
+    return df
+
+
+def roster_arrays(roster, n_stores=1):
+    """Roster from catalog.scale_roster() rows; every trading minute of every weekday needs a cashier."""
+    start = np.array([r[1] for r in roster[:len(roster) // n_stores]], dtype=np.int64)
+    end = np.array([r[2] for r in roster[:len(roster) // n_stores]], dtype=np.int64)
+    weekdays = np.zeros((len(start), 7), dtype=bool)
+    for j, (_, _, _, days) in enumerate(roster[:len(start)]):
+        weekdays[j, list(days)] = True
+    trading = np.arange(OPEN_HOUR * 60, (CLOSE_HOUR + 1) * 60)
+    on = (start[:, None] <= trading) & (trading < end[:, None])
+    for wd in range(7):
+        gap = np.flatnonzero(~on[weekdays[:, wd]].any(axis=0))
+        if len(gap):
+            m = int(trading[gap[0]])
+            raise ValueError(f"roster leaves {catalog.WEEKDAYS[wd].title()} {m // 60:02d}:{m % 60:02d} without a cashier")
+    return Roster(np.array([r[0] for r in roster], dtype=np.int64).reshape(n_stores, -1), start, end, weekdays)
+
+
+def menu_arrays(products, recipes, inventory, scale_factor=1.0, roster=None):
+    """Menu from catalog-shaped rows: (product_id, name, price), (product_id, ingredient_id, qty), (ingredient_id, ...).
+
+    roster is catalog.scale_roster() rows; without one orders get employee_id 0.
+    """
+    products = sorted(products)
+    own = {}
+    for pid, iid, _ in recipes:
+        own.setdefault(pid, []).append(iid)
+    lines = [sorted(own.get(pid, [])) for pid, _, _ in products]
+    return Menu(
+        np.array([pid for pid, _, _ in products], dtype=np.int64),
+        np.array([round(price * 100) for _, _, price in products], dtype=np.int64),
+        np.concatenate(([0], np.cumsum([len(line) for line in lines]))).astype(np.int64),
+        np.array([iid for line in lines for iid in line], dtype=np.int64),
+        np.array(sorted(row[0] for row in inventory), dtype=np.int64),
+        scale_factor,
+        roster_arrays(roster, catalog.stores(scale_factor)) if roster else None,
+    )
+
+
+def read_dataset(scale_factor=1.0):
+    """The catalog CSVs, staff and roster at scale_factor: (catalog.Catalog, employee rows, Menu)."""
+    cat = catalog.scale(catalog.read_catalog(), scale_factor)
+    roster = catalog.scale_roster(catalog.read_roster(), scale_factor)
+    return (cat, catalog.scale_employees(scale_factor),
+            menu_arrays(cat.products, cat.recipes, cat.inventory, scale_factor, roster))
+
+
+def catalog_stage_rows(cat, employees):
+    """Rows for the employees, inventory, products and product_recipe stage tables."""
+    return {
+        "employees_stage": employees,
+        "inventory_stage": cat.inventory,
+        "products_stage": cat.products,
+        "product_recipe_stage": cat.recipes,
+    }
+
+
+def write_catalog_stages(cat, employees, out_dir=BASE_DIR):
+    for table, rows in catalog_stage_rows(cat, employees).items():
+        with open(stage_path(table[:-len("_stage")], out_dir), "w", newline="", encoding="utf-8") as c:
+            w = csv.writer(c); w.writerow(STAGE_COLUMNS[table].split(", "))
+            w.writerows(rows)
+
+
+def is_special_day(day):
+    return (day.month, day.day) in SPECIAL_DAYS
+
+
+def expected_order_cents(menu):
+    """Mean order total: average unit price plus expected add-ons, times items and quantity."""
+    unit = float(menu.prices_cents.mean()) + MODIFICATION_RATE * float(MOD_PRICE_CENTS.mean())
+    return unit * (1 + MAX_LINES_PER_ORDER) / 2.0 * (1 + MAX_QTY_PER_LINE) / 2.0
+
+
+def plan_daily_orders(menu, start=START_DATE, end=END_DATE, sales_target=None):
+    """Spread the order count implied by the sales target (default: scaled with the menu) evenly over the date range."""
+    if sales_target is None:
+        sales_target = TOTAL_SALES_TARGET * menu.scale_factor
+    days = (end - start).days + 1
+    total_orders = max(1, int(sales_target * 100 / expected_order_cents(menu)))
+    counts = np.full(days, total_orders // days, dtype=np.int64)
+    counts[:total_orders % days] += 1
+    return counts
+
+
+def daily_sales_target(scale_factor=1.0):
+    """Average sales per day of the default history at scale_factor, used to size appended days."""
+    return TOTAL_SALES_TARGET * scale_factor / ((END_DATE - START_DATE).days + 1)
+
+
+def draw_modifications(rng, pick, menu, rate=MODIFICATION_RATE, store=None):
+    """Modifications for items of menu positions pick: (item index, ingredient_id, type index) arrays.
+
+    ADD takes any of the store's ingredients (store: per item, default the
+    first); REMOVE, LESS and EXTRA one from the product's own recipe
+    (products without a recipe only get ADDs).
+    """
+    item = np.flatnonzero(rng.random(len(pick)) < rate)
+    kind = rng.integers(0, len(MOD_TYPES), size=len(item))
+    lo = menu.recipe_offsets[pick[item]]
+    n_own = menu.recipe_offsets[pick[item] + 1] - lo
+    own_at = lo + (rng.random(len(item)) * n_own).astype(np.int64)
+    per_store = len(menu.ingredient_ids) // catalog.stores(menu.scale_factor)
+    any_at = rng.integers(0, per_store, size=len(item))
+    if store is not None:
+        any_at += store[item] * per_store
+    any_ingredient = menu.ingredient_ids[any_at]
+    kind[n_own == 0] = MOD_TYPES.index("ADD")
+    if len(menu.recipe_ingredients):
+        own = menu.recipe_ingredients[np.where(n_own > 0, own_at, 0)]
+        ingredient = np.where(kind == MOD_TYPES.index("ADD"), any_ingredient, own)
+    else:
+        ingredient = any_ingredient
+    return item, ingredient, kind
+
+
+def assign_cashiers(rng, minute, store, weekday, roster):
+    """employee_id per order: one of the store's cashiers whose shift covers the order's minute.
+
+    Where shifts overlap, each cashier on duty is equally likely.
+    """
+    on = roster.weekdays[:, weekday] & (roster.start <= minute[:, None]) & (minute[:, None] < roster.end)
+    counts = on.sum(axis=1)
+    if len(counts) and counts.min() == 0:
+        raise ValueError(f"no cashier on shift at minute {int(minute[counts == 0][0])} of weekday {weekday}")
+    k = (rng.random(len(minute)) * counts).astype(np.int64)
+    line = np.argmax(np.cumsum(on, axis=1) > k[:, None], axis=1)
+    return roster.employee_ids[store, line]
+
+
+def draw_orders(rng, n, menu, day=0, weekday=0):
+    """Draw n orders at once: timestamps, store, line counts, products, quantities, modifications and cashier."""
+    hour = rng.integers(OPEN_HOUR, CLOSE_HOUR + 1, size=n)
+    minute = hour * 60 + rng.integers(0, 60, size=n)
+    lines = rng.integers(1, MAX_LINES_PER_ORDER + 1, size=n)
+    n_items = int(lines.sum())
+    n_stores = catalog.stores(menu.scale_factor)
+    # a single store draws nothing, which keeps its stream the same as before stores existed
+    store = rng.integers(0, n_stores, size=n) if n_stores > 1 else np.zeros(n, dtype=np.int64)
+    per_store = len(menu.product_ids) // n_stores
+    item_store = np.repeat(store, lines)
+    pick = item_store * per_store + rng.integers(0, per_store, size=n_items)
+    quantity = rng.integers(1, MAX_QTY_PER_LINE + 1, size=n_items)
+    unit_cents = menu.prices_cents[pick]
+    mod_item, mod_ingredient, mod_type = draw_modifications(rng, pick, menu, store=item_store)
+    add_on = np.bincount(mod_item, weights=MOD_PRICE_CENTS[mod_type], minlength=n_items).astype(np.int64)
+    total_cents = _order_totals(quantity * (unit_cents + add_on), lines)
+    if menu.roster is None:
+        employee_id = np.zeros(n, dtype=np.int64)
     else:
-        todays_orders = orders_per_day + (1 if d < remainder_days else 0)
-        for _ in range(todays_orders):
-            hour = random.randint(7, 20)
-            minute = random.randint(0, 59)
-            ts = day.replace(hour=hour, minute=minute, second=0)
-            num_lines = random.randint(1, 4)
-            order_total = 0.0
-            lines = []
-            for _ in range(num_lines):
-                prod = df.sample(n=1).iloc[0]
-                pid = int(prod["product_id"])
-                base_price = float(prod["unit_price"])
-                qty = random.randint(1, 5)
-                unit_price_at_sale = round(base_price, 2)
-                order_total += unit_price_at_sale * qty
-                lines.append((order_item_id, order_id, pid, qty, f"{unit_price_at_sale:.2f}"))
-                order_item_id += 1
-            orders_rows.append([order_id, ts.strftime("%Y-%m-%d %H:%M:%S"), f"{order_total:.2f}"])
-            for row in lines:
-                order_items_rows.append(list(row))
-            order_id += 1
-
-with open(ORDERS_STAGE_CSV, "w", newline="", encoding="utf-8") as c:
-    w = csv.writer(c); w.writerow(["order_id", "order_date", "total_amount"]); w.writerows(orders_rows)
-with open(ORDER_ITEMS_STAGE_CSV, "w", newline="", encoding="utf-8") as c:
-    w = csv.writer(c); w.writerow(["order_item_id", "order_id", "product_id", "quantity", "unit_price_at_sale"])
-    w.writerows(order_items_rows)
-
-with open(OUTPUT_SQL, "w", encoding="utf-8") as f:
-    f.write("BEGIN;\n")
-    f.write("SET synchronous_commit = off;\n\n")
-    f.write("CREATE UNLOGGED TABLE IF NOT EXISTS products_stage (product_id integer, product_name text, unit_price numeric(10,2));\n")
-    f.write("CREATE UNLOGGED TABLE IF NOT EXISTS orders_stage (order_id integer, order_date timestamp, total_amount numeric(10,2));\n")
-    f.write("CREATE UNLOGGED TABLE IF NOT EXISTS order_items_stage (order_item_id integer, order_id integer, product_id integer, quantity integer, unit_price_at_sale numeric(10,2));\n")
-    f.write("CREATE UNLOGGED TABLE IF NOT EXISTS product_recipe_stage (product_id integer, ingredient_name text, quantity_per_unit numeric(10,1));\n\n")
-    f.write(f"\\copy products_stage (product_id, product_name, unit_price) FROM '{PRODUCTS_STAGE_CSV}' CSV HEADER;\n")
-    f.write(f"\\copy orders_stage (order_id, order_date, total_amount) FROM '{ORDERS_STAGE_CSV}' CSV HEADER;\n")
-    f.write(f"\\copy order_items_stage (order_item_id, order_id, product_id, quantity, unit_price_at_sale) FROM '{ORDER_ITEMS_STAGE_CSV}' CSV HEADER;\n")
-    f.write(f"\\copy product_recipe_stage (product_id, ingredient_name, quantity_per_unit) FROM '{PRODUCT_RECIPE_STAGE_CSV}' CSV HEADER;\n\n")
-    f.write("INSERT INTO products (product_id, product_name, unit_price)\n")
-    f.write("SELECT product_id, product_name, unit_price FROM products_stage\n")
-    f.write("ON CONFLICT (product_id) DO UPDATE SET product_name = EXCLUDED.product_name, unit_price = EXCLUDED.unit_price;\n\n")
-    f.write("INSERT INTO product_recipe (product_id, ingredient_id, quantity_per_unit)\n")
-    f.write("SELECT prs.product_id, i.ingredient_id, prs.quantity_per_unit\n")
-    f.write("FROM product_recipe_stage prs\n")
-    f.write("JOIN inventory i ON lower(i.ingredient_name) = lower(prs.ingredient_name)\n")
-    f.write("ON CONFLICT (product_id, ingredient_id) DO NOTHING;\n\n")
-    f.write("INSERT INTO orders (order_id, order_date, total_amount, employee_id)\n")
-    f.write("WITH days AS (\n")
-    f.write("    SELECT DISTINCT order_date::date AS day FROM orders_stage\n")
-    f.write("),\n")
-    f.write("cashiers AS (\n")
-    f.write("    SELECT employee_id FROM employees WHERE role = 'Cashier'\n")
-    f.write("),\n")
-    f.write("day_cashier AS (\n")
-    f.write("    SELECT d.day, c.employee_id,\n")
-    f.write("           ROW_NUMBER() OVER (PARTITION BY d.day ORDER BY random()) AS rn\n")
-    f.write("    FROM days d\n")
-    f.write("    CROSS JOIN cashiers c\n")
-    f.write(")\n")
-    f.write("SELECT os.order_id, os.order_date, os.total_amount, dc.employee_id\n")
-    f.write("FROM orders_stage os\n")
-    f.write("JOIN day_cashier dc\n")
-    f.write("  ON os.order_date::date = dc.day\n")
-    f.write("WHERE dc.rn = 1;\n\n")
-    f.write("INSERT INTO order_items (order_item_id, order_id, product_id, quantity, unit_price_at_sale)\n")
-    f.write("SELECT order_item_id, order_id, product_id, quantity, unit_price_at_sale FROM order_items_stage;\n\n")
-    f.write("DROP TABLE products_stage;\n")
-    f.write("DROP TABLE orders_stage;\n")
-    f.write("DROP TABLE order_items_stage;\n")
-    f.write("DROP TABLE product_recipe_stage;\n\n")
-    f.write("SELECT setval('products_product_id_seq', (SELECT COALESCE(MAX(product_id),0) FROM products));\n")
-    f.write("SELECT setval('orders_order_id_seq', (SELECT COALESCE(MAX(order_id),0) FROM orders));\n")
-    f.write("SELECT setval('order_items_order_item_id_seq', (SELECT COALESCE(MAX(order_item_id),0) FROM order_items));\n")
-    f.write("COMMIT;\n")
\ No newline at end of file
+        employee_id = assign_cashiers(rng, minute, store, weekday, menu.roster)
+    day = np.broadcast_to(np.asarray(day, dtype=np.int64), (n,)).copy()
+    return OrderBatch(day, minute, lines, total_cents, employee_id, menu.product_ids[pick], quantity, unit_cents,
+                      mod_item, mod_ingredient, mod_type)
+
+
+def draw_special_day(rng, day, menu, min_cents=None, weekday=0):
+    """Keep drawing orders for one day until its running total reaches min_cents (default scales with the menu)."""
+    if min_cents is None:
+        min_cents = SPECIAL_DAY_MIN_SALES * 100 * menu.scale_factor
+    expected = expected_order_cents(menu)
+    parts, total = [], 0
+    while total < min_cents:
+        n = int((min_cents - total) / expected * 1.25) + 1
+        batch = draw_orders(rng, n, menu, day, weekday)
+        running = total + np.cumsum(batch.total_cents)
+        hit = int(np.searchsorted(running, min_cents))
+        if hit < n:
+            batch = slice_orders(batch, 0, hit + 1)
+        parts.append(batch)
+        total = int(running[min(hit, n - 1)])
+    return concat_orders(parts)
+
+
+def _order_totals(line_cents, lines):
+    starts = np.cumsum(lines) - lines
+    return np.add.reduceat(line_cents, starts) if len(lines) else np.zeros(0, dtype=np.int64)
+
+
+def slice_orders(batch, lo, hi):
+    item_offsets = np.concatenate(([0], np.cumsum(batch.lines)))
+    ilo, ihi = item_offsets[lo], item_offsets[hi]
+    mlo, mhi = np.searchsorted(batch.mod_item, [ilo, ihi])
+    return OrderBatch(
+        batch.day[lo:hi], batch.minute[lo:hi], batch.lines[lo:hi], batch.total_cents[lo:hi], batch.employee_id[lo:hi],
+        batch.product_id[ilo:ihi], batch.quantity[ilo:ihi], batch.unit_cents[ilo:ihi],
+        batch.mod_item[mlo:mhi] - ilo, batch.mod_ingredient[mlo:mhi], batch.mod_type[mlo:mhi],
+    )
+
+
+def concat_orders(batches):
+    item_offsets = np.cumsum([0] + [len(b.product_id) for b in batches[:-1]])
+    cols = {name: np.concatenate([getattr(b, name) for b in batches]) for name in OrderBatch._fields}
+    cols["mod_item"] = np.concatenate([b.mod_item + offset for b, offset in zip(batches, item_offsets)])
+    return OrderBatch(**cols)
+
+
+def day_rng(day, seed=SEED):
+    """Independent random stream for one calendar day, so any day can be generated on its own."""
+    return np.random.default_rng([seed, day.toordinal()])
+
+
+def generate_orders(menu, start=START_DATE, counts=None, seed=SEED):
+    """Generate the orders for consecutive days from start, counts[d] of them on day d."""
+    if counts is None:
+        counts = plan_daily_orders(menu, start)
+    parts = []
+    for d, n in enumerate(counts.tolist()):
+        day = start + timedelta(days=d)
+        if is_special_day(day):
+            parts.append(draw_special_day(day_rng(day, seed), d, menu, weekday=day.weekday()))
+        else:
+            parts.append(draw_orders(day_rng(day, seed), n, menu, d, day.weekday()))
+    return concat_orders(parts)
+
+
+def _money(cents):
+    return [f"{c // 100}.{c % 100:02d}" for c in cents.tolist()]
+
+
+def _order_times(batch, start):
+    return np.datetime64(start, "m") + batch.day * 1440 + batch.minute
+
+
+def _order_dates(batch, start):
+    stamps = np.datetime_as_string(_order_times(batch, start), unit="s")
+    # np.char.replace fails on an empty array, i.e. a chunk of days that drew no orders
+    return np.char.replace(stamps, "T", " ") if len(stamps) else stamps
+
+
+def order_rows(batch, start=START_DATE, first_order_id=1):
+    order_id = np.arange(first_order_id, first_order_id + len(batch))
+    return zip(order_id.tolist(), _order_dates(batch, start).tolist(), _money(batch.total_cents),
+               batch.employee_id.tolist())
+
+
+def order_item_rows(batch, start=START_DATE, first_order_id=1, first_item_id=1):
+    """Item rows carry their order's date, the partition key of a partitioned order_items."""
+    n_items = len(batch.product_id)
+    item_id = np.arange(first_item_id, first_item_id + n_items)
+    order_id = np.repeat(np.arange(first_order_id, first_order_id + len(batch)), batch.lines)
+    order_date = np.repeat(_order_dates(batch, start), batch.lines)
+    return zip(item_id.tolist(), order_id.tolist(), order_date.tolist(), batch.product_id.tolist(),
+               batch.quantity.tolist(), _money(batch.unit_cents))
+
+
+def modification_rows(batch, first_item_id=1, first_mod_id=1):
+    mod_id = np.arange(first_mod_id, first_mod_id + len(batch.mod_item))
+    return zip(mod_id.tolist(), (batch.mod_item + first_item_id).tolist(), batch.mod_ingredient.tolist(),
+               np.array(MOD_TYPES)[batch.mod_type].tolist(), np.array(MOD_QUANTITY)[batch.mod_type].tolist(),
+               _money(MOD_PRICE_CENTS[batch.mod_type]))
+
+
+def order_copy_data(batch, start=START_DATE, first_order_id=1, first_item_id=1, first_mod_id=1):
+    """The orders, order_items and modifications stage rows as binary COPY tuples (see artifacts.py)."""
+    import artifacts
+
+    order_id = np.arange(first_order_id, first_order_id + len(batch))
+    ts = _order_times(batch, start)
+    n_items, n_mods = len(batch.product_id), len(batch.mod_item)
+    return (
+        artifacts.encode(STAGE_TABLES["orders_stage"], [order_id, ts, batch.total_cents, batch.employee_id]),
+        artifacts.encode(STAGE_TABLES["order_items_stage"], [
+            np.arange(first_item_id, first_item_id + n_items), np.repeat(order_id, batch.lines),
+            np.repeat(ts, batch.lines), batch.product_id, batch.quantity, batch.unit_cents]),
+        artifacts.encode(STAGE_TABLES["modifications_stage"], [
+            np.arange(first_mod_id, first_mod_id + n_mods), batch.mod_item + first_item_id, batch.mod_ingredient,
+            np.array(MOD_TYPES)[batch.mod_type], MOD_QUANTITY_TENTHS[batch.mod_type], MOD_PRICE_CENTS[batch.mod_type]]),
+    )
+
+
+def chunk_bounds(counts, chunk_days=CHUNK_DAYS, chunk_orders=CHUNK_ORDERS):
+    """Split day indexes into [lo, hi) runs of at most chunk_days days and (past the first day) chunk_orders orders."""
+    lo, n = 0, 0
+    for d, c in enumerate(counts.tolist()):
+        if d > lo and (d - lo >= chunk_days or n + c > chunk_orders):
+            yield lo, d
+            lo, n = d, 0
+        n += c
+    if lo < len(counts):
+        yield lo, len(counts)
+
+
+def iter_order_chunks(menu, start=START_DATE, counts=None, chunk_days=CHUNK_DAYS, chunk_orders=CHUNK_ORDERS,
+                      seed=SEED):
+    """Yield (chunk_start, batch) for each chunk of the date range, so memory is bounded by the chunk size."""
+    if counts is None:
+        counts = plan_daily_orders(menu, start)
+    for lo, hi in chunk_bounds(counts, chunk_days, chunk_orders):
+        chunk_start = start + timedelta(days=lo)
+        yield chunk_start, generate_orders(menu, chunk_start, counts[lo:hi], seed)
+
+
+def generate(config=Config()):
+    """Yield the stage rows for config as RowBatches, the catalog tables first, then the orders chunk by chunk.
+
+    Ids and values match what seeder.py writes for the same settings
+    (config.workers and config.format don't apply; rows are generated here).
+    """
+    cat, employees, menu = read_dataset(config.scale_factor)
+    for table, rows in catalog_stage_rows(cat, employees).items():
+        yield RowBatch(table, rows)
+    counts = plan_daily_orders(menu, config.start, config.end, config.sales_target)
+    order_id = item_id = mod_id = 1
+    for start, batch in iter_order_chunks(menu, config.start, counts, config.chunk_days, config.chunk_orders,
+                                          config.seed):
+        yield RowBatch("orders_stage", list(order_rows(batch, start, order_id)))
+        yield RowBatch("order_items_stage", list(order_item_rows(batch, start, order_id, item_id)))
+        yield RowBatch("modifications_stage", list(modification_rows(batch, item_id, mod_id)))
+        order_id += len(batch)
+        item_id += len(batch.product_id)
+        mod_id += len(batch.mod_item)
+
+
+def csv_text(rows):
+    buf = io.StringIO()
+    csv.writer(buf).writerows(rows)
+    return buf.getvalue()
+
+
+def render_chunk(menu, start, counts, first_order_id, first_item_id, first_mod_id, fmt="csv", seed=SEED):
+    """Generate one chunk and render it as a Chunk of CSV text, or of binary COPY tuples with fmt="binary"."""
+    with profiling.span("generate") as s:
+        batch = generate_orders(menu, start, counts, seed)
+        s.rows = len(batch) + len(batch.product_id) + len(batch.mod_item)
+    sizes = len(batch), len(batch.product_id), len(batch.mod_item)
+    with profiling.span(f"render {fmt}", sum(sizes)):
+        if fmt == "binary":
+            return Chunk(*order_copy_data(batch, start, first_order_id, first_item_id, first_mod_id), *sizes)
+        return Chunk(csv_text(order_rows(batch, start, first_order_id)),
+                     csv_text(order_item_rows(batch, start, first_order_id, first_item_id)),
+                     csv_text(modification_rows(batch, first_item_id, first_mod_id)), *sizes)
+
+
+_worker_menu = None
+
+
+def _init_worker(menu):
+    global _worker_menu
+    _worker_menu = menu
+
+
+def _shard_size(start, counts, seed):
+    batch = generate_orders(_worker_menu, start, counts, seed)
+    return len(batch), len(batch.product_id), len(batch.mod_item)
+
+
+def _render_shard(start, counts, first_order_id, first_item_id, first_mod_id, fmt, seed):
+    return render_chunk(_worker_menu, start, counts, first_order_id, first_item_id, first_mod_id, fmt, seed)
+
+
+def _in_order(ex, fn, arg_list, window):
+    """Like ex.map, but never more than window results ahead of the consumer."""
+    pending = deque()
+    for args in arg_list:
+        pending.append(ex.submit(fn, *args))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def iter_stage_chunks(menu, start=START_DATE, counts=None, workers=1, chunk_days=CHUNK_DAYS,
+                      chunk_orders=CHUNK_ORDERS, first_order_id=1, first_item_id=1, first_mod_id=1, fmt="csv",
+                      seed=SEED):
+    """Yield rendered Chunks in date order; the bytes are the same for any worker count.
+
+    With workers > 1 the chunks are shards for a process pool: a first pass
+    counts each shard's orders, items and modifications, a prefix sum over
+    those counts gives every shard its first ids, and a second pass renders
+    the shards. Each day draws from its own seeded stream, so regenerating
+    is exact.
+    """
+    if counts is None:
+        counts = plan_daily_orders(menu, start)
+    shards = [(start + timedelta(days=lo), counts[lo:hi]) for lo, hi in chunk_bounds(counts, chunk_days, chunk_orders)]
+    if workers <= 1:
+        order_id, item_id, mod_id = first_order_id, first_item_id, first_mod_id
+        for shard_start, shard_counts in shards:
+            chunk = render_chunk(menu, shard_start, shard_counts, order_id, item_id, mod_id, fmt, seed)
+            order_id += chunk.n_orders
+            item_id += chunk.n_items
+            mod_id += chunk.n_mods
+            yield chunk
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(menu,)) as ex:
+        sizing = [(s, c, seed) for s, c in shards]
+        sizes = np.array(list(_in_order(ex, _shard_size, sizing, len(shards))), dtype=np.int64).reshape(-1, 3)
+        first_ids = np.array([first_order_id, first_item_id, first_mod_id]) + np.cumsum(sizes, axis=0) - sizes
+        jobs = [(s, c, *map(int, ids), fmt, seed) for (s, c), ids in zip(shards, first_ids)]
+        yield from _in_order(ex, _render_shard, jobs, 2 * workers)
+
+
+def write_order_stages(chunks, out_dir=BASE_DIR):
+    """Stream rendered chunks into the orders/order_items/modifications stage CSVs; returns row counts."""
+    n_orders = n_items = n_mods = 0
+    with open(stage_path("orders", out_dir), "w", newline="", encoding="utf-8") as oc, \
+         open(stage_path("order_items", out_dir), "w", newline="", encoding="utf-8") as ic, \
+         open(stage_path("modifications", out_dir), "w", newline="", encoding="utf-8") as mc:
+        for f, table in ((oc, "orders_stage"), (ic, "order_items_stage"), (mc, "modifications_stage")):
+            csv.writer(f).writerow(STAGE_COLUMNS[table].split(", "))
+        for chunk in chunks:
+            with profiling.span("write csv", chunk.n_orders + chunk.n_items + chunk.n_mods):
+                oc.write(chunk.orders)
+                ic.write(chunk.items)
+                mc.write(chunk.mods)
+            n_orders += chunk.n_orders
+            n_items += chunk.n_items
+            n_mods += chunk.n_mods
+    return n_orders, n_items, n_mods
+
+
+def write_binary_stages(cat, employees, chunks, out_dir=BASE_DIR, **meta):
+    """Write every stage table as a gzip'd binary COPY artifact plus manifest.json; returns order row counts.
+
+    chunks must have been rendered with fmt="binary".
+    """
+    import artifacts
+
+    n_orders = n_items = n_mods = 0
+    with artifacts.ArtifactWriter(out_dir, STAGE_TABLES, **meta) as w:
+        for table, rows in catalog_stage_rows(cat, employees).items():
+            w.write(table, artifacts.encode_rows(STAGE_TABLES[table], rows), len(rows))
+        for chunk in chunks:
+            with profiling.span("write binary", chunk.n_orders + chunk.n_items + chunk.n_mods):
+                w.write("orders_stage", chunk.orders, chunk.n_orders)
+                w.write("order_items_stage", chunk.items, chunk.n_items)
+                w.write("modifications_stage", chunk.mods, chunk.n_mods)
+            n_orders += chunk.n_orders
+            n_items += chunk.n_items
+            n_mods += chunk.n_mods
+    return n_orders, n_items, n_mods
+
+
+STAGE_TABLES = {
+    "employees_stage": "employee_id integer, name text, role text",
+    "inventory_stage": "ingredient_id integer, ingredient_name text, on_hand_quantity numeric(10,1)",
+    "products_stage": "product_id integer, product_name text, unit_price numeric(10,2)",
+    "product_recipe_stage": "product_id integer, ingredient_id integer, quantity_per_unit numeric(10,1)",
+    "orders_stage": "order_id integer, order_date timestamp, total_amount numeric(10,2), employee_id integer",
+    "order_items_stage": "order_item_id integer, order_id integer, order_date timestamp, product_id integer, quantity integer, unit_price_at_sale numeric(10,2)",
+    "modifications_stage": "modification_id integer, order_item_id integer, ingredient_id integer, modification_type text, quantity_change numeric(10,1), price_change numeric(10,2)",
+}
+STAGE_COLUMNS = {
+    "employees_stage": "employee_id, name, role",
+    "inventory_stage": "ingredient_id, ingredient_name, on_hand_quantity",
+    "products_stage": "product_id, product_name, unit_price",
+    "product_recipe_stage": "product_id, ingredient_id, quantity_per_unit",
+    "orders_stage": "order_id, order_date, total_amount, employee_id",
+    "order_items_stage": "order_item_id, order_id, order_date, product_id, quantity, unit_price_at_sale",
+    "modifications_stage": "modification_id, order_item_id, ingredient_id, modification_type, quantity_change, price_change",
+}
+# the tables every sale writes, in foreign key order
+ORDER_TABLES = ("orders", "order_items", "modifications")
+
+# staging -> final table statements, keyed by target table
+INSERT_SQL = {
+    "employees": (
+        "INSERT INTO employees (employee_id, name, role)\n"
+        "SELECT employee_id, name, role::employee_role FROM employees_stage\n"
+        "ON CONFLICT (employee_id) DO UPDATE SET name = EXCLUDED.name, role = EXCLUDED.role;\n"
+    ),
+    # stock levels belong to the depletion ledger once loaded, so existing rows are left alone
+    "inventory": (
+        "INSERT INTO inventory (ingredient_id, ingredient_name, on_hand_quantity)\n"
+        "SELECT ingredient_id, ingredient_name, on_hand_quantity FROM inventory_stage\n"
+        "ON CONFLICT (ingredient_id) DO NOTHING;\n"
+    ),
+    "products": (
+        "INSERT INTO products (product_id, product_name, unit_price)\n"
+        "SELECT product_id, product_name, unit_price FROM products_stage\n"
+        "ON CONFLICT (product_id) DO UPDATE SET product_name = EXCLUDED.product_name, unit_price = EXCLUDED.unit_price;\n"
+    ),
+    "product_recipe": (
+        "INSERT INTO product_recipe (product_id, ingredient_id, quantity_per_unit)\n"
+        "SELECT product_id, ingredient_id, quantity_per_unit FROM product_recipe_stage\n"
+        "ON CONFLICT (product_id, ingredient_id) DO NOTHING;\n"
+    ),
+    # employee_id comes from the shift roster at generation time (see assign_cashiers)
+    "orders": (
+        "INSERT INTO orders (order_id, order_date, total_amount, employee_id)\n"
+        "SELECT order_id, order_date, total_amount, employee_id FROM orders_stage;\n"
+    ),
+    "order_items": (
+        "INSERT INTO order_items (order_item_id, order_id, order_date, product_id, quantity, unit_price_at_sale)\n"
+        "SELECT order_item_id, order_id, order_date, product_id, quantity, unit_price_at_sale FROM order_items_stage;\n"
+    ),
+    "modifications": (
+        "INSERT INTO modifications (modification_id, order_item_id, ingredient_id, modification_type, quantity_change, price_change)\n"
+        "SELECT modification_id, order_item_id, ingredient_id, modification_type::modification_type, quantity_change, price_change\n"
+        "FROM modifications_stage;\n"
+    ),
+}
+# each level only depends on the ones before it, so tables within a level can load in parallel
+LOAD_LEVELS = [["employees", "inventory", "products"], ["orders", "product_recipe"], ["order_items"], ["modifications"]]
+
+# explicit ids bypass the sequences; keep them ahead for later inserts
+SETVAL_SQL = {
+    table: f"SELECT setval('{table}_{column}_seq', (SELECT COALESCE(MAX({column}),0) + 1 FROM {table}), false);\n"
+    for table, column in (("employees", "employee_id"), ("inventory", "ingredient_id"), ("products", "product_id"),
+                          ("orders", "order_id"), ("order_items", "order_item_id"),
+                          ("modifications", "modification_id"))
+}
+
+
+def create_stage_sql(table):
+    return f"CREATE UNLOGGED TABLE IF NOT EXISTS {table} ({STAGE_TABLES[table]});\n"
+
+
+def write_seed_sql(out_dir=BASE_DIR, path=None, fmt="csv"):
+    """Write the psql script that loads the stage files in out_dir; it goes next to them unless path is given."""
+    import artifacts
+
+    if path is None:
+        path = os.path.join(out_dir, OUTPUT_SQL)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("BEGIN;\n")
+        f.write("SET synchronous_commit = off;\n\n")
+        f.writelines(create_stage_sql(t) for t in STAGE_TABLES)
+        f.write("\n")
+        for table, columns in STAGE_COLUMNS.items():
+            if fmt == "binary":
+                artifact = os.path.join(out_dir, table + artifacts.SUFFIX)
+                f.write(f"\\copy {table} ({columns}) FROM PROGRAM 'gzip -dc \"{artifact}\"' WITH (FORMAT binary);\n")
+            else:
+                f.write(f"\\copy {table} ({columns}) FROM '{stage_path(table[:-len('_stage')], out_dir)}' CSV HEADER;\n")
+        f.write("\n")
+        for level in LOAD_LEVELS:
+            for target in level:
+                f.write(INSERT_SQL[target] + "\n")
+        f.writelines(f"DROP TABLE {t};\n" for t in STAGE_TABLES)
+        f.write("\n")
+        f.writelines(SETVAL_SQL.values())
+        f.write("COMMIT;\n")
+
+
+def add_generation_args(p):
+    """Options shared by every entry point that generates orders."""
+    p.add_argument("--start", type=datetime.fromisoformat, default=START_DATE, help="first day (YYYY-MM-DD)")
+    p.add_argument("--end", type=datetime.fromisoformat, default=END_DATE, help="last day (YYYY-MM-DD)")
+    p.add_argument("--scale-factor", type=float, default=1.0,
+                   help="dataset size: sales and special days scale with it, and every whole unit adds a store's "
+                        "worth of employees, products, ingredients and recipes")
+    p.add_argument("--sales-target", type=float, help="total sales over the range (default: 1M x scale factor)")
+    p.add_argument("--seed", type=int, default=SEED, help="random seed; the same seed and settings give the same data")
+    p.add_argument("--chunk-days", type=int, default=CHUNK_DAYS, help="max days generated and flushed per chunk")
+    p.add_argument("--chunk-orders", type=int, default=CHUNK_ORDERS, help="max orders per chunk (a day is never split)")
+    p.add_argument("--workers", type=int, default=1, help="generator processes; output is identical for any count")
+    p.add_argument("--profile", metavar="REPORT.json",
+                   help="time each phase (rows/s, peak RSS, SQL statements) and write the report here")
+    p.add_argument("--cprofile", metavar="FILE.pstats", help="dump a cProfile of the order generation loop")
+    return p
+
+
+def check_generation_args(p, args):
+    """Reject option combinations add_generation_args can't express, with argparse's usual error."""
+    if args.start > args.end:
+        p.error(f"--start {args.start:%Y-%m-%d} is after --end {args.end:%Y-%m-%d}")
+    if args.scale_factor <= 0:
+        p.error(f"--scale-factor must be positive, got {args.scale_factor:g}")
+    if args.sales_target is not None and args.sales_target <= 0:
+        p.error(f"--sales-target must be positive, got {args.sales_target:g}")
+    for option in ("chunk_days", "chunk_orders", "workers"):
+        if getattr(args, option) < 1:
+            p.error(f"--{option.replace('_', '-')} must be at least 1, got {getattr(args, option)}")
+    return args
+
+
+def parse_args(argv=None):
+    p = add_generation_args(argparse.ArgumentParser(description="Generate staging CSVs and seed.sql for the database"))
+    p.add_argument("--out-dir", default=BASE_DIR,
+                   help="directory for the *_stage.csv files or binary artifacts, and the seed.sql that loads them "
+                        "(created if missing)")
+    p.add_argument("--format", choices=["csv", "binary"], default="csv",
+                   help="binary: gzip'd binary COPY files and manifest.json instead of CSVs (loader.py --from-artifacts)")
+    return check_generation_args(p, p.parse_args(argv))
+
+
+def config_from_args(args):
+    return Config(**{field: getattr(args, field) for field in Config._fields})
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    config = config_from_args(args)
+    if args.profile:
+        profiler = profiling.start()
+    os.makedirs(args.out_dir, exist_ok=True)
+    t0 = time.perf_counter()
+    with profiling.span("read catalog"):
+        cat, employees, menu = read_dataset(config.scale_factor)
+    if config.format == "csv":
+        with profiling.span("write catalog stages", len(cat.products) + len(cat.inventory) + len(cat.recipes)):
+            write_catalog_stages(cat, employees, args.out_dir)
+
+    with profiling.span("plan"):
+        counts = plan_daily_orders(menu, config.start, config.end, config.sales_target)
+    with profiling.span("orders") as s, profiling.cprofile(args.cprofile):
+        # with --workers > 1 generation happens in other processes; only "orders" itself is timed
+        chunks = iter_stage_chunks(menu, config.start, counts, config.workers, config.chunk_days, config.chunk_orders,
+                                   fmt=config.format, seed=config.seed)
+        if config.format == "binary":
+            n_orders, n_items, n_mods = write_binary_stages(
+                cat, employees, chunks, args.out_dir, seed=config.seed, scale_factor=config.scale_factor,
+                start=config.start, end=config.end, sales_target=config.sales_target)
+        else:
+            n_orders, n_items, n_mods = write_order_stages(chunks, args.out_dir)
+        s.rows = n_orders + n_items + n_mods
+    with profiling.span("write seed.sql"):
+        write_seed_sql(args.out_dir, fmt=config.format)
+
+    rss = peak_rss_mb()
+    print(f"Wrote {len(employees)} employees, {len(cat.products)} products, {len(cat.inventory)} ingredients, "
+          f"{len(cat.recipes)} recipe lines, {n_orders} orders / {n_items} order items / {n_mods} modifications "
+          f"in {time.perf_counter() - t0:.2f}s"
+          + (f", peak RSS {rss:.1f} MB" if rss is not None else ""))
+    if args.profile:
+        profiling.print_report(profiler.write(args.profile, command="seeder.py", args=vars(args)))
+        profiling.stop()
+
+
+if __name__ == "__main__":
+    main()
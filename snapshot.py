@@ -0,0 +1,175 @@
+"""Columnar on-disk snapshot of the sales tables for offline reporting.
+
+One .npy file per column, memory-mapped on open, so reading a snapshot
+costs nothing until a report touches a column. Money is int cents,
+quantities with one decimal are int tenths, timestamps are int seconds
+since 1970-01-01 (wall clock, as stored), and text columns are
+dictionary-encoded: int32 codes plus a JSON list of distinct values.
+manifest.json is written last, so a directory without one is incomplete.
+"""
+import os
+import json
+import time
+import argparse
+import tempfile
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+
+import db_schema
+
+STR = 'str'
+
+# table -> [(column, SQL expression, dtype)]
+TABLES = {
+    'orders': [
+        ('order_id', 'order_id', 'int32'),
+        ('order_ts', 'EXTRACT(EPOCH FROM order_date)::bigint', 'int64'),
+        ('total_cents', '(total_amount * 100)::bigint', 'int64'),
+        ('employee_id', 'employee_id', 'int32'),
+    ],
+    'order_items': [
+        ('order_item_id', 'order_item_id', 'int32'),
+        ('order_id', 'order_id', 'int32'),
+        ('product_id', 'product_id', 'int32'),
+        ('quantity', 'quantity', 'int32'),
+        ('unit_price_cents', '(unit_price_at_sale * 100)::bigint', 'int64'),
+    ],
+    'products': [
+        ('product_id', 'product_id', 'int32'),
+        ('product_name', 'product_name', STR),
+        ('unit_price_cents', '(unit_price * 100)::bigint', 'int64'),
+    ],
+    'product_recipe': [
+        ('product_id', 'product_id', 'int32'),
+        ('ingredient_id', 'ingredient_id', 'int32'),
+        ('quantity_tenths', '(quantity_per_unit * 10)::bigint', 'int64'),
+    ],
+    'inventory': [
+        ('ingredient_id', 'ingredient_id', 'int32'),
+        ('ingredient_name', 'ingredient_name', STR),
+        ('on_hand_tenths', '(on_hand_quantity * 10)::bigint', 'int64'),
+    ],
+    # the cashier reports filter on role
+    'employees': [
+        ('employee_id', 'employee_id', 'int32'),
+        ('name', 'name', STR),
+        ('role', 'role::text', STR),
+    ],
+}
+CHUNK_ROWS = 1_000_000
+
+
+def _path(out_dir, table, column, suffix='.npy'):
+    return os.path.join(out_dir, f'{table}.{column}{suffix}')
+
+
+def _export_table(cur, out_dir, table, columns):
+    """COPY one table to a temp file, then parse it in chunks straight into the column files."""
+    cur.execute(f'SELECT COUNT(*) FROM {table}')
+    rows = cur.fetchone()[0]
+    arrays = {
+        name: np.lib.format.open_memmap(_path(out_dir, table, name), mode='w+',
+                                        dtype='int32' if dtype == STR else dtype, shape=(rows,))
+        for name, _, dtype in columns
+    }
+    names = [name for name, _, _ in columns]
+    dictionaries = {name: {} for name, _, dtype in columns if dtype == STR}
+    select = ', '.join(expr for _, expr, _ in columns)
+    with tempfile.TemporaryFile('w+', encoding='utf-8') as tmp:
+        cur.copy_expert(f'COPY (SELECT {select} FROM {table}) TO STDOUT WITH (FORMAT csv)', tmp)
+        tmp.seek(0)
+        at = 0
+        dtypes = {name: (str if dtype == STR else dtype) for name, _, dtype in columns}
+        for chunk in pd.read_csv(tmp, header=None, names=names, dtype=dtypes, keep_default_na=False,
+                                 chunksize=CHUNK_ROWS):
+            n = len(chunk)
+            for name in names:
+                values = chunk[name].to_numpy()
+                if name in dictionaries:
+                    codes = dictionaries[name]
+                    values = np.fromiter((codes.setdefault(v, len(codes)) for v in values), dtype='int32', count=n)
+                arrays[name][at:at + n] = values
+            at += n
+    for name, array in arrays.items():
+        array.flush()
+    for name, codes in dictionaries.items():
+        with open(_path(out_dir, table, name, '.dict.json'), 'w', encoding='utf-8') as f:
+            json.dump(list(codes), f)
+    return rows
+
+
+def export(engine, out_dir):
+    """Write every table in TABLES from one consistent database snapshot; returns the manifest."""
+    os.makedirs(out_dir, exist_ok=True)
+    manifest_path = os.path.join(out_dir, 'manifest.json')
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+    manifest = {'version': 1, 'exported_at': datetime.now().isoformat(timespec='seconds'), 'tables': {}}
+    with engine.connect().execution_options(isolation_level='REPEATABLE READ') as conn:
+        with conn.connection.dbapi_connection.cursor() as cur:
+            for table, columns in TABLES.items():
+                rows = _export_table(cur, out_dir, table, columns)
+                manifest['tables'][table] = {'rows': rows, 'columns': {name: dtype for name, _, dtype in columns}}
+            cur.execute('SELECT COALESCE(MAX(order_id), 0) FROM orders')
+            manifest['last_order_id'] = cur.fetchone()[0]
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+class Snapshot:
+    """Read side of a snapshot directory; columns are memory-mapped on first use."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, 'manifest.json'), encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        self._columns = {}
+
+    def rows(self, table):
+        return self.manifest['tables'][table]['rows']
+
+    def col(self, table, column):
+        """The column as a read-only memory-mapped array (codes for text columns)."""
+        key = table, column
+        if key not in self._columns:
+            # an empty file can't be mapped
+            self._columns[key] = np.load(_path(self.path, table, column), mmap_mode='r' if self.rows(table) else None)
+        return self._columns[key]
+
+    def dictionary(self, table, column):
+        with open(_path(self.path, table, column, '.dict.json'), encoding='utf-8') as f:
+            return np.array(json.load(f), dtype=object)
+
+    def strings(self, table, column):
+        """Decoded values of a text column (meant for the small dimension tables)."""
+        return self.dictionary(table, column)[self.col(table, column)]
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description='Export the sales tables to a memory-mappable columnar snapshot')
+    p.add_argument('out_dir', help='snapshot directory (created if missing, overwritten otherwise)')
+    p.add_argument('--url', help='SQLAlchemy database URL (overrides DATABASE_URL env)')
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    load_dotenv()
+    db_url = args.url or os.environ.get('DATABASE_URL')
+
+    if not db_url:
+        print('ERROR: no database URL provided. Set DATABASE_URL or pass --url')
+        return
+
+    t0 = time.perf_counter()
+    manifest = export(db_schema.get_engine(db_url), args.out_dir)
+    size = sum(os.path.getsize(os.path.join(args.out_dir, f)) for f in os.listdir(args.out_dir))
+    counts = ', '.join(f'{t} {m["rows"]}' for t, m in manifest['tables'].items())
+    print(f'Exported {counts} to {args.out_dir} ({size / 2**20:.1f} MB) in {time.perf_counter() - t0:.2f}s')
+
+
+if __name__ == '__main__':
+    main()